@@ -7,7 +7,7 @@ from model.promise import Promise
 from services.promises import PromiseService
 from services.events import EventService
 from services.recommendation_followups import RecommendationFollowUpService
-from services.signal_matching import match_signal, promise_target_signature
+from services.signal_matching import normalize_event_signal, promise_target_matcher, promise_target_signature
 from services.users import UserService
 from processes.promise_processor import PromiseProcessor
 from gabru.flask.util import render_flask_template
@@ -24,14 +24,7 @@ def _should_filter_by_exact_event_type(promise: Promise) -> bool:
 
 
 def _event_matches_promise_filters(event, promise: Promise) -> bool:
-    signature = promise_target_signature(promise)
-    return match_signal(
-        signal_event_types=[event.event_type],
-        signal_tags=event.tags or [],
-        target_event_type=signature["target_event_type"],
-        target_tags=signature["target_tags"],
-        tag_match_mode=signature["tag_match_mode"],
-    ).matched
+    return promise_target_matcher(promise)(*normalize_event_signal(event.event_type, event.tags))
 
 def process_promise_data(data):
     # Initialize next_check_at if not provided
@@ -95,9 +88,6 @@ class PromiseApp(App[Promise]):
             last_check = promise.last_checked_at or promise.created_at
             
             # Simple window query
-            from services.events import EventService
-            ev_service = EventService()
-            
             filters = {
                 "user_id": promise.user_id,
                 "timestamp": {"$gt": last_check, "$lt": end_time}
@@ -105,7 +95,7 @@ class PromiseApp(App[Promise]):
             if _should_filter_by_exact_event_type(promise):
                 filters["event_type"] = promise.target_event_type
             
-            events = ev_service.find_all(filters=filters)
+            events = event_service.find_all(filters=filters)
             count = sum(1 for e in events if _event_matches_promise_filters(e, promise))
             
             promise.current_count = count
@@ -1,4 +1,6 @@
+import os
 import plistlib
+import tempfile
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
@@ -15,6 +17,28 @@ source: claude-sonnet-4.5
 log = Logger.get_log('ShortcutBuilder')
 
 
+# Content types every generated shortcut accepts as input; the same for all shortcuts.
+INPUT_CONTENT_ITEM_CLASSES = (
+    "WFAppStoreAppContentItem",
+    "WFArticleContentItem",
+    "WFContactContentItem",
+    "WFDateContentItem",
+    "WFEmailAddressContentItem",
+    "WFGenericFileContentItem",
+    "WFImageContentItem",
+    "WFiTunesProductContentItem",
+    "WFLocationContentItem",
+    "WFDCMapsLinkContentItem",
+    "WFAVAssetContentItem",
+    "WFPDFContentItem",
+    "WFPhoneNumberContentItem",
+    "WFRichTextContentItem",
+    "WFSafariWebPageContentItem",
+    "WFStringContentItem",
+    "WFURLContentItem",
+)
+
+
 class HTTPMethod(Enum):
     """Supported HTTP methods"""
     GET = "GET"
@@ -355,25 +379,7 @@ class ShortcutBuilder:
                 "WFWorkflowIconGlyphNumber": self.icon_glyph
             },
             "WFWorkflowImportQuestions": [],
-            "WFWorkflowInputContentItemClasses": [
-                "WFAppStoreAppContentItem",
-                "WFArticleContentItem",
-                "WFContactContentItem",
-                "WFDateContentItem",
-                "WFEmailAddressContentItem",
-                "WFGenericFileContentItem",
-                "WFImageContentItem",
-                "WFiTunesProductContentItem",
-                "WFLocationContentItem",
-                "WFDCMapsLinkContentItem",
-                "WFAVAssetContentItem",
-                "WFPDFContentItem",
-                "WFPhoneNumberContentItem",
-                "WFRichTextContentItem",
-                "WFSafariWebPageContentItem",
-                "WFStringContentItem",
-                "WFURLContentItem"
-            ],
+            "WFWorkflowInputContentItemClasses": list(INPUT_CONTENT_ITEM_CLASSES),
             "WFWorkflowMinimumClientVersion": 900,
             "WFWorkflowMinimumClientVersionString": "900",
             "WFWorkflowOutputContentItemClasses": [],
@@ -393,11 +399,17 @@ class ShortcutBuilder:
         if not filepath.endswith('.shortcut'):
             filepath += '.shortcut'
 
-        shortcut_dict = self.build()
-        plist_data = plistlib.dumps(shortcut_dict, fmt=plistlib.FMT_BINARY)
-
-        with open(filepath, 'wb') as f:
-            f.write(plist_data)
+        # Serialize straight into a temp file next to the target instead of
+        # building the whole binary plist in memory, then swap it into place so
+        # a failed write never leaves a partial .shortcut behind.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filepath)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                plistlib.dump(self.build(), f, fmt=plistlib.FMT_BINARY)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
 
         log.info(f"✓ Saved: {filepath}")
         return filepath
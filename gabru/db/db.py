@@ -1,10 +1,12 @@
 import atexit
+import hashlib
 import os
+import select
 import threading
 from urllib.parse import urlparse
 
 import psycopg2
-from psycopg2 import InterfaceError, OperationalError
+from psycopg2 import InterfaceError, OperationalError, sql
 from dotenv import load_dotenv
 
 from gabru.log import Logger
@@ -21,6 +23,10 @@ class DB:
 
     _shared_connections = {}
     _shared_lock = threading.Lock()
+    # (connection, prepared statement names) per shared connection key.
+    # Prepared statements live on the connection, so the entry is dropped with it.
+    _prepared_statements = {}
+    _prepare_lock = threading.Lock()
     _atexit_registered = False
 
     def __init__(self, default_dbname: str):
@@ -73,6 +79,7 @@ class DB:
                 except Exception:
                     pass
             cls._shared_connections.clear()
+            cls._prepared_statements.clear()
 
     def _is_connection_usable(self, conn) -> bool:
         return bool(conn) and getattr(conn, "closed", 1) == 0
@@ -106,6 +113,7 @@ class DB:
             if self._is_connection_usable(conn):
                 return conn
 
+            DB._prepared_statements.pop(self._connection_key, None)
             conn = self._connect()
             if conn:
                 DB._shared_connections[self._connection_key] = conn
@@ -119,18 +127,66 @@ class DB:
         """Closes the shared connection for this logical DB, if requested explicitly."""
         with DB._shared_lock:
             conn = DB._shared_connections.pop(self._connection_key, None)
+            DB._prepared_statements.pop(self._connection_key, None)
             if self._is_connection_usable(conn):
                 conn.close()
 
     def invalidate_connection(self):
         with DB._shared_lock:
             conn = DB._shared_connections.pop(self._connection_key, None)
+            DB._prepared_statements.pop(self._connection_key, None)
         if self._is_connection_usable(conn):
             try:
                 conn.close()
             except Exception:
                 pass
 
+    def execute_prepared(self, cursor, name: str, statement: str, params: tuple = ()):
+        """
+        Executes `statement` (written with $1..$n placeholders) as a named
+        server-side prepared statement, so Postgres parses and plans it once per
+        shared connection instead of on every call. The statement's hash is part
+        of the server-side name, so two services sharing a table and a name
+        prefix can never run each other's columns.
+        """
+        name = f"{name}_{hashlib.md5(statement.encode()).hexdigest()[:12]}"
+        with DB._prepare_lock:
+            conn, prepared = DB._prepared_statements.get(self._connection_key, (None, None))
+            if conn is not cursor.connection:
+                prepared = set()
+                DB._prepared_statements[self._connection_key] = (cursor.connection, prepared)
+            if name not in prepared:
+                cursor.execute(sql.SQL("PREPARE {} AS {}").format(sql.Identifier(name), sql.SQL(statement)))
+                prepared.add(name)
+
+        if params:
+            placeholders = sql.SQL(", ").join(sql.Placeholder() * len(params))
+            cursor.execute(sql.SQL("EXECUTE {} ({})").format(sql.Identifier(name), placeholders), tuple(params))
+        else:
+            cursor.execute(sql.SQL("EXECUTE {}").format(sql.Identifier(name)))
+
+    def open_listener(self, channel: str):
+        """
+        Opens a dedicated connection subscribed to a NOTIFY channel.
+        Listeners block in select(), so they never share the pooled connection.
+        """
+        conn = self._connect()
+        if not conn:
+            return None
+        with conn.cursor() as cursor:
+            cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+        return conn
+
+    @staticmethod
+    def wait_for_notify(listener, timeout: float) -> bool:
+        """Blocks up to `timeout` seconds and returns True if any notification arrived."""
+        if select.select([listener], [], [], timeout) == ([], [], []):
+            return False
+        listener.poll()
+        received = bool(listener.notifies)
+        listener.notifies.clear()
+        return received
+
     def rollback_quietly(self):
         conn = self.get_conn()
         if not self._is_connection_usable(conn):
@@ -1,7 +1,9 @@
 from abc import abstractmethod
-from typing import Optional, List, TypeVar, Generic, Dict, Any
+from typing import Optional, List, TypeVar, Generic, Dict, Any, Iterator
+from uuid import uuid4
 
 from flask import has_request_context
+from psycopg2.extras import execute_batch, execute_values
 
 from gabru.auth import PermissionManager
 from gabru.db.db import DB
@@ -11,9 +13,53 @@ T = TypeVar('T')
 
 log = Logger.get_log('ReadOnlyService')
 
+
+def _eq_clause(column: str, value) -> tuple[str, list]:
+    # "= NULL" never matches in SQL, so a None filter has to become IS NULL
+    if value is None:
+        return f"{column} IS NULL", []
+    return f"{column} = %s", [value]
+
+
+def _in_clause(column: str, values) -> tuple[str, list]:
+    # One array parameter instead of a placeholder per item, so the statement
+    # text is the same for any list length (and an empty list is valid SQL).
+    return f"{column} = ANY(%s)", [list(values)]
+
+
+def _lt_clause(column: str, value) -> tuple[str, list]:
+    return f"{column} < %s", [value]
+
+
+def _gt_clause(column: str, value) -> tuple[str, list]:
+    return f"{column} > %s", [value]
+
+
+def _close_quietly(cursor):
+    try:
+        cursor.close()
+    except Exception:
+        pass
+
+
+# Rows per INSERT statement in create_many; larger batches are split into pages.
+CREATE_MANY_PAGE_SIZE = 500
+
+# find_all operator -> clause builder, looked up once per filter operator
+_FILTER_OPERATORS = {
+    "$in": _in_clause,
+    "$lt": _lt_clause,
+    "$gt": _gt_clause,
+}
+
+
 class ReadOnlyService(Generic[T]):
     """ ReadOnlyService also useful for queue processor """
 
+    # NOTIFY channel raised when new rows land, so queue processors can wake
+    # up instead of polling. None means consumers fall back to polling.
+    notify_channel: Optional[str] = None
+
     def __init__(self, table_name: str, db: DB, user_scoped: bool = False, user_scope_column: str = "user_id"):
         self.table_name = table_name
         self.db = db
@@ -54,7 +100,16 @@ class ReadOnlyService(Generic[T]):
 
         def operation(conn):
             with conn.cursor() as cursor:
-                cursor.execute(query, tuple(params))
+                if user_scope is None:
+                    # Every update and the processors' lookups go through here.
+                    self.db.execute_prepared(
+                        cursor,
+                        f"{self.table_name}_by_id",
+                        f"SELECT {columns} FROM {self.table_name} WHERE id = $1",
+                        (obj_id,),
+                    )
+                else:
+                    cursor.execute(query, tuple(params))
                 row = cursor.fetchone()
                 if row:
                     return self._to_object(row)
@@ -74,8 +129,9 @@ class ReadOnlyService(Generic[T]):
         filters = self._with_request_user_scope(filters)
         if filters:
             for column, filter_val in filters.items():
-                where_clauses.append(f"{column} = %s")
-                params.append(filter_val)
+                clause, clause_params = _eq_clause(column, filter_val)
+                where_clauses.append(clause)
+                params.extend(clause_params)
             if where_clauses:
                 query += " WHERE " + " AND ".join(where_clauses)
         def operation(conn):
@@ -121,7 +177,16 @@ class ReadOnlyService(Generic[T]):
 
         def operation(conn):
             with conn.cursor() as cursor:
-                cursor.execute(query, tuple(params))
+                if user_scope is None:
+                    # Queue processors poll this constantly, so keep its plan on the server.
+                    self.db.execute_prepared(
+                        cursor,
+                        f"{self.table_name}_items_after",
+                        f"SELECT {columns} FROM {self.table_name} WHERE id > $1 ORDER BY id ASC LIMIT $2",
+                        (last_id, limit),
+                    )
+                else:
+                    cursor.execute(query, tuple(params))
                 rows = cursor.fetchall()
                 return [self._to_object(row) for row in rows]
 
@@ -132,6 +197,56 @@ class ReadOnlyService(Generic[T]):
         Retrieves items from the database based on flexible filters and sorting.
         This is a crucial improvement for performance.
         """
+        query, params = self._build_find_query(filters, sort_by)
+
+        def operation(conn):
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+                return [self._to_object(row) for row in rows]
+
+        return self._run_with_connection_retry(operation, fallback=[], action_name=f"find_all on {self.table_name}")
+
+    def iter_all(self, filters: Optional[Dict[str, Any]] = None, sort_by: Optional[Dict[str, str]] = None,
+                 batch_size: int = 500) -> Iterator[T]:
+        """
+        Same filters as find_all, but streams rows through a server-side cursor
+        batch_size at a time instead of loading the whole result set. Meant for
+        large scans that are consumed once.
+        """
+        # Build the query now so the request user scope applies even if the
+        # iterator is consumed later.
+        query, params = self._build_find_query(filters, sort_by)
+        return self._iter_rows(query, params, batch_size)
+
+    def _iter_rows(self, query: str, params: tuple, batch_size: int) -> Iterator[T]:
+        def open_cursor(conn):
+            # Connections run in autocommit, where only WITH HOLD cursors stay open.
+            cursor = conn.cursor(name=f"{self.table_name}_iter_{uuid4().hex}", withhold=True)
+            try:
+                cursor.execute(query, params)
+                return cursor, cursor.fetchmany(batch_size)
+            except Exception:
+                _close_quietly(cursor)
+                raise
+
+        # Declaring the cursor and reading the first batch go through the retry
+        # helper like find_all, so a stale connection after a Postgres restart
+        # is replaced instead of failing the caller.
+        opened = self._run_with_connection_retry(open_cursor, fallback=None, action_name=f"iter_all on {self.table_name}")
+        if opened is None:
+            return
+        cursor, rows = opened
+        try:
+            while rows:
+                for row in rows:
+                    yield self._to_object(row)
+                rows = cursor.fetchmany(batch_size)
+        finally:
+            _close_quietly(cursor)
+
+    def _build_find_query(self, filters: Optional[Dict[str, Any]] = None,
+                          sort_by: Optional[Dict[str, str]] = None) -> tuple[str, tuple]:
         columns = ", ".join(self._get_columns_for_select())
         query = f"SELECT {columns} FROM {self.table_name}"
         where_clauses = []
@@ -144,20 +259,15 @@ class ReadOnlyService(Generic[T]):
                 if isinstance(filter_val, dict):
                     # Handle advanced operators like $in and $lt
                     for op, val in filter_val.items():
-                        if op == "$in":
-                            # For IN clauses, use %s for each item
-                            placeholders = ", ".join(["%s"] * len(val))
-                            where_clauses.append(f"{column} IN ({placeholders})")
-                            params.extend(val)
-                        elif op == "$lt":
-                            where_clauses.append(f"{column} < %s")
-                            params.append(val)
-                        elif op == "$gt":
-                            where_clauses.append(f"{column} > %s")
-                            params.append(val)
+                        build_clause = _FILTER_OPERATORS.get(op)
+                        if build_clause:
+                            clause, clause_params = build_clause(column, val)
+                            where_clauses.append(clause)
+                            params.extend(clause_params)
                 else:
-                    where_clauses.append(f"{column} = %s")
-                    params.append(filter_val)
+                    clause, clause_params = _eq_clause(column, filter_val)
+                    where_clauses.append(clause)
+                    params.extend(clause_params)
 
             if where_clauses:
                 query += " WHERE " + " AND ".join(where_clauses)
@@ -166,13 +276,7 @@ class ReadOnlyService(Generic[T]):
             sort_clauses = [f"{col} {order}" for col, order in sort_by.items()]
             query += " ORDER BY " + ", ".join(sort_clauses)
 
-        def operation(conn):
-            with conn.cursor() as cursor:
-                cursor.execute(query, tuple(params))
-                rows = cursor.fetchall()
-                return [self._to_object(row) for row in rows]
-
-        return self._run_with_connection_retry(operation, fallback=[], action_name=f"find_all on {self.table_name}")
+        return query, tuple(params)
 
     def find_one_by_field(self, field_name: str, value: Any) -> Optional[T]:
         """Retrieves a single object by a specific field and value."""
@@ -267,15 +371,18 @@ class CRUDService(ReadOnlyService[T]):
         if obj.id is None:
             return False
         self._apply_request_user_scope_to_object(obj)
-        existing = self.get_by_id(obj.id)
-        if self.user_scoped and self._get_request_user_scope() is not None and not existing:
-            return False
 
         columns_and_placeholders = [f"{col}=%s" for col in self._get_columns_for_update()]
         set_clause = ", ".join(columns_and_placeholders)
         query = f"UPDATE {self.table_name} SET {set_clause} WHERE id=%s"
 
         values = self._to_tuple(obj) + (obj.id,)
+        # Ownership is checked by the UPDATE itself rather than a get_by_id first,
+        # so a request pays one round trip; a row owned by someone else matches nothing.
+        user_scope = self._get_request_user_scope()
+        if user_scope is not None:
+            query += f" AND {self.user_scope_column} = %s"
+            values += (user_scope,)
 
         def operation(conn):
             with conn.cursor() as cursor:
@@ -292,10 +399,76 @@ class CRUDService(ReadOnlyService[T]):
             self.log.warning("Update failed for %s id=%s", self.table_name, obj.id)
             return False
 
+    def create_many(self, objs: List[T]) -> List[int]:
+        """Inserts several objects with one multi-row INSERT and returns their new ids in order."""
+        if not objs:
+            return []
+        for obj in objs:
+            self._apply_request_user_scope_to_object(obj)
+        columns = ", ".join(self._get_columns_for_insert())
+        query = f"INSERT INTO {self.table_name} ({columns}) VALUES %s RETURNING id"
+        values = [self._to_tuple(obj) for obj in objs]
+
+        def operation(conn):
+            with conn.cursor() as cursor:
+                rows = execute_values(cursor, query, values, page_size=CREATE_MANY_PAGE_SIZE, fetch=True)
+                conn.commit()
+                return [row[0] for row in rows]
+
+        try:
+            return self._run_with_connection_retry(operation, fallback=[], action_name=f"create_many on {self.table_name}")
+        except Exception as e:
+            self.db.rollback_quietly()
+            self.log.exception(e)
+            self.log.warning("Batch create failed for %s with %s rows", self.table_name, len(values))
+            return []
+
+    def update_many(self, objs: List[T], columns: Optional[List[str]] = None) -> bool:
+        """
+        Updates several existing objects with a single batched round trip.
+
+        With columns, only those columns are written, straight from the objects'
+        attributes of the same name. Background writers use this so a copy
+        loaded a moment ago cannot overwrite fields someone else just edited.
+        """
+        # One UPDATE per row id; if an object shows up twice its last state wins.
+        objs = list({obj.id: obj for obj in objs if obj.id is not None}.values())
+        if not objs:
+            return True
+        for obj in objs:
+            self._apply_request_user_scope_to_object(obj)
+
+        if columns:
+            def to_values(obj) -> tuple:
+                return tuple(getattr(obj, col) for col in columns)
+        else:
+            columns = self._get_columns_for_update()
+            to_values = self._to_tuple
+        set_clause = ", ".join(f"{col}=%s" for col in columns)
+        query = f"UPDATE {self.table_name} SET {set_clause} WHERE id=%s"
+        user_scope = self._get_request_user_scope()
+        if user_scope is not None:
+            query += f" AND {self.user_scope_column} = %s"
+            values = [to_values(obj) + (obj.id, user_scope) for obj in objs]
+        else:
+            values = [to_values(obj) + (obj.id,) for obj in objs]
+
+        def operation(conn):
+            with conn.cursor() as cursor:
+                execute_batch(cursor, query, values)
+                conn.commit()
+                return True
+
+        try:
+            return self._run_with_connection_retry(operation, fallback=False, action_name=f"update_many on {self.table_name}")
+        except Exception as e:
+            self.db.rollback_quietly()
+            self.log.exception(e)
+            self.log.warning("Batch update failed for %s ids=%s", self.table_name, [obj.id for obj in objs])
+            return False
+
     def delete(self, obj_id: int) -> bool:
         """Deletes an object by its ID."""
-        if self.user_scoped and self._get_request_user_scope() is not None and not self.get_by_id(obj_id):
-            return False
         query = f"DELETE FROM {self.table_name} WHERE id=%s"
         params = [obj_id]
         user_scope = self._get_request_user_scope()
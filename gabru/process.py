@@ -17,8 +17,20 @@ class Process(threading.Thread):
         super().__init__(name=name, daemon=daemon)
         self.log = Logger.get_log(self.name)
         self.enabled = enabled
+        self._stop_requested = threading.Event()
         self.running = True
 
+    @property
+    def running(self) -> bool:
+        return not self._stop_requested.is_set()
+
+    @running.setter
+    def running(self, value: bool):
+        if value:
+            self._stop_requested.clear()
+        else:
+            self._stop_requested.set()
+
     def run(self):
         try:
             self.process()
@@ -28,6 +40,13 @@ class Process(threading.Thread):
     def stop(self):
         self.running = False
 
+    def wait_for_stop(self, timeout: float) -> bool:
+        """
+        Sleeps for up to `timeout` seconds but wakes as soon as stop() is called.
+        Returns True when the process was asked to stop.
+        """
+        return self._stop_requested.wait(timeout)
+
     @abstractmethod
     def process(self):
         pass
@@ -1,4 +1,5 @@
 import time
+from collections import deque
 from abc import abstractmethod
 from typing import Generic, TypeVar
 
@@ -28,11 +29,12 @@ class QueueProcessor(Generic[T], Process):
         self.service = service
         self.q_service = QueueService()
         self._set_up_queue_stats()
-        self.queue = []
+        self.queue = deque()
         self.max_queue_size = 10
         self.sleep_time_sec = 5
         self.checkpoint_every = 10
         self._items_since_persist = 0
+        self._listener = None
         self.q_stats: QueueStats
 
     def _set_up_queue_stats(self):
@@ -55,7 +57,55 @@ class QueueProcessor(Generic[T], Process):
 
     def qprocessor_sleep(self):
         self.log.info(f"Nothing to do, waiting for {self.sleep_time_sec}s")
-        time.sleep(self.sleep_time_sec)
+        self.wait_for_new_items(self.sleep_time_sec)
+
+    def wait_for_new_items(self, timeout: float):
+        """
+        Sleeps until the source service announces new rows, the process is
+        stopped, or `timeout` passes. Without a notify channel this is a
+        plain interruptible sleep, so the timeout doubles as the poll interval.
+        """
+        listener = self._get_listener()
+        if listener is None:
+            self.wait_for_stop(timeout)
+            return
+
+        deadline = time.monotonic() + timeout
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                # Wait in short slices so stop() is still noticed promptly.
+                if self.service.db.wait_for_notify(listener, min(remaining, 1.0)):
+                    return
+            except Exception as e:
+                self.log.warning(f"Lost notify listener, falling back to polling: {e}")
+                self._close_listener()
+                self.wait_for_stop(max(deadline - time.monotonic(), 0))
+                return
+
+    def _get_listener(self):
+        channel = getattr(self.service, "notify_channel", None)
+        if not isinstance(channel, str):
+            return None
+        if self._listener is not None and not self._listener.closed:
+            return self._listener
+        try:
+            self._listener = self.service.db.open_listener(channel)
+        except Exception as e:
+            self.log.warning(f"Could not listen on {channel}, polling instead: {e}")
+            self._listener = None
+        return self._listener
+
+    def _close_listener(self):
+        if self._listener is None:
+            return
+        try:
+            self._listener.close()
+        except Exception:
+            pass
+        self._listener = None
 
     def process(self):
         while self.running:
@@ -73,6 +123,7 @@ class QueueProcessor(Generic[T], Process):
                     # nothing to do since this item is filtered, just update id
                     self.q_stats.last_consumed_id = next_item.id
                     self._mark_checkpoint_progress()
+        self._close_listener()
 
     def process_item(self, item: T) -> bool:
         result = self._process_item(item)
@@ -88,18 +139,17 @@ class QueueProcessor(Generic[T], Process):
         return result
 
     def get_next_item(self) -> T:
-        if len(self.queue) > 0:
-            return self.queue.pop(0)
-
-        # if in-memory queue length is 0 then first update qstats
-        self._persist_queue_stats()
+        if not self.queue:
+            # if in-memory queue length is 0 then first update qstats
+            self._persist_queue_stats()
 
-        # then fetch next batch of items from db
-        items_from_queue = self.service.get_all_items_after(self.q_stats.last_consumed_id, limit=self.max_queue_size)
-        if items_from_queue:
+            # then fetch next batch of items from db
+            items_from_queue = self.service.get_all_items_after(self.q_stats.last_consumed_id, limit=self.max_queue_size)
+            if not items_from_queue:
+                return None
             self.queue.extend(items_from_queue)
-            return self.get_next_item()
-        return None
+
+        return self.queue.popleft()
 
     def _persist_queue_stats(self):
         if not getattr(self.q_stats, "id", None):
@@ -114,7 +164,7 @@ class QueueProcessor(Generic[T], Process):
 
     def reload_queue_state(self, last_consumed_id: int):
         self.q_stats.last_consumed_id = last_consumed_id
-        self.queue = []
+        self.queue.clear()
         self._items_since_persist = 0
         self._persist_queue_stats()
         self.log.info(f"Reloaded queue state to id {last_consumed_id}")
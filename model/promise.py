@@ -1,5 +1,5 @@
 from typing import Optional, List
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 from datetime import datetime
 
 from gabru.flask.model import WidgetUIModel
@@ -42,3 +42,6 @@ class Promise(WidgetUIModel):
 
     created_at: datetime = Field(default_factory=datetime.now, edit_enabled=False, description="When the promise was created")
     updated_at: datetime = Field(default_factory=datetime.now, edit_enabled=False, description="When the promise was last updated")
+
+    # (target fields, normalized signature, compiled matcher) kept by services.signal_matching
+    _target_signature: Optional[tuple] = PrivateAttr(default=None)
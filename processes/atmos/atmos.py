@@ -4,7 +4,6 @@ from gabru.process import Process
 from model.device import Device
 from model.event import Event
 from services.devices import DeviceService
-import time
 import numpy as np
 
 from services.events import EventService
@@ -66,7 +65,7 @@ class Atmos(Process):
 
     def sleep(self):
         self.log.info(f"Nothing to do, waiting for {self.sleep_time_sec}s")
-        time.sleep(self.sleep_time_sec)
+        self.wait_for_stop(self.sleep_time_sec)
 
     def get_device_ble_data(self, device: Device):
         # call device.url to fetch the data
@@ -1,7 +1,6 @@
 import json
 import os
 import subprocess
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -29,7 +28,7 @@ class BackupScheduler(Process):
                 "next_run_at": self._next_run_at_iso(status),
                 "interval_seconds": self.interval_seconds,
             })
-            time.sleep(self.poll_seconds)
+            self.wait_for_stop(self.poll_seconds)
 
     def get_operator_snapshot(self) -> dict:
         status = self.read_status()
@@ -3,6 +3,7 @@ import time
 from datetime import datetime
 
 import requests
+from requests.adapters import HTTPAdapter
 from gabru.qprocessor.qprocessor import QueueProcessor
 from model.event import Event
 from model.notification import Notification
@@ -37,15 +38,22 @@ class Courier(QueueProcessor[Event]):
         self.default_ntfy_topic = os.getenv("NTFY_TOPIC", "rasbhari-alerts")
         self.ntfy_retry_attempts = 3
         self.ntfy_retry_delays_sec = [2, 5, 10]
+        # Reuse keep-alive connections to the ntfy server across notifications
+        # instead of paying a TCP + TLS handshake per POST. Retries stay in
+        # send_ntfy_notification so the adapter does not retry on its own.
+        self.http_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.http_session.mount("http://", adapter)
+        self.http_session.mount("https://", adapter)
 
         # Processing Filter
-        self.allowed_event_tag_types = ['notification']
+        self.allowed_event_tag_types: frozenset[str] = frozenset({'notification'})
 
     def filter_item(self, event: Event):
         """
         Only process events that have the 'notification' tag.
         """
-        if event.tags and 'notification' in event.tags:
+        if event.tags and not self.allowed_event_tag_types.isdisjoint(event.tags):
             return event
         return None
 
@@ -143,7 +151,7 @@ class Courier(QueueProcessor[Event]):
 
         for attempt in range(1, self.ntfy_retry_attempts + 1):
             try:
-                response = requests.post(
+                response = self.http_session.post(
                     ntfy_url,
                     data=event.description.encode('utf-8'),
                     headers=headers,
@@ -203,7 +203,7 @@ class Heimdall(Process):
 
             while self.running:
                 device_stats = self.device_stats[device.name]
-                start_time = time.time()
+                start_time = time.perf_counter()
                 ret, frame = device_capture.read()
                 if not ret or frame is None:
                     self.log.warning(
@@ -232,7 +232,7 @@ class Heimdall(Process):
                 with self.latest_frame_lock:
                     self.latest_frame[device.name] = processed_frame.copy()
 
-                time_taken_ms = (time.time() - start_time) * 1000
+                time_taken_ms = (time.perf_counter() - start_time) * 1000
 
                 # Update running average time
                 device_stats.average_time = ((
@@ -316,7 +316,7 @@ class Heimdall(Process):
 
     def sleep(self):
         self.log.info(f"Nothing to do, waiting for {self.sleep_time_sec}s")
-        time.sleep(self.sleep_time_sec)
+        self.wait_for_stop(self.sleep_time_sec)
 
 def create_tracker_event_dict(identified_object: IdentifiedObject):
     description = f"{identified_object.name} identified in {identified_object.location} by {identified_object.device_name}"
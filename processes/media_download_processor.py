@@ -35,7 +35,7 @@ class MediaDownloadProcessor(Process):
             queued_item = self.media_service.get_next_queued_download()
             if not queued_item:
                 self.log.info("No rTV downloads queued, waiting for %ss", self.sleep_time_sec)
-                time.sleep(self.sleep_time_sec)
+                self.wait_for_stop(self.sleep_time_sec)
                 continue
             self._download_item(queued_item)
 
@@ -1,13 +1,22 @@
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Iterable, Optional
 
 from gabru.qprocessor.qprocessor import QueueProcessor
 from model.event import Event
 from model.promise import Promise
-from services.promises import PromiseService
+from services.promises import PROMISE_COUNTER_COLUMNS, PROMISE_EVALUATION_COLUMNS, PromiseService
 from services.events import EventService
-from services.signal_matching import match_signal, promise_target_signature
+from services.signal_matching import normalize_event_signal, promise_target_matcher, promise_target_signature
+
+# Length of one evaluation period per recurring frequency. "monthly" is an approximation.
+PERIOD_BY_FREQUENCY = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+    "monthly": timedelta(days=30),
+}
+# For 'once', effectively never again
+ONCE_RECHECK_PERIOD = timedelta(days=36500)
 
 class PromiseProcessor(QueueProcessor[Event]):
     def __init__(self, **kwargs):
@@ -15,6 +24,18 @@ class PromiseProcessor(QueueProcessor[Event]):
         self.event_service = EventService()
         super().__init__(service=self.event_service, **kwargs)
         self.sleep_time_sec = 60
+        # Bursts of events from the same user would otherwise re-read that
+        # user's promises once per event. Keep a short-lived copy instead.
+        self.promise_cache_ttl_sec = 2
+        # user_id -> (loaded_at, promises, referenced event types, referenced tags)
+        self._user_promises_cache: dict[int, tuple[float, list[Promise], frozenset[str], frozenset[str]]] = {}
+        # PromiseService.changes as of the cached entries; any promise write
+        # made outside this processor empties the cache.
+        self._promise_changes_seen = PromiseService.changes
+        # Promise periods are days long, so sweeping for due promises after
+        # every single event only repeats the same query.
+        self.due_check_interval_sec = 60
+        self._next_due_check_at = 0.0
 
     def filter_item(self, event: Event) -> Optional[Event]:
         return event
@@ -24,7 +45,13 @@ class PromiseProcessor(QueueProcessor[Event]):
         if not event.user_id:
             return True
 
-        user_promises = self.promise_service.find_all(filters={"user_id": event.user_id})
+        _, user_promises, referenced_types, referenced_tags = self._get_user_promise_entry(event.user_id)
+        event_signal = normalize_event_signal(event.event_type, event.tags)
+        event_types, event_tags = event_signal
+        # Most events mention nothing any of the user's promises target.
+        if referenced_types.isdisjoint(event_types) and referenced_tags.isdisjoint(event_tags):
+            return True
+
         active_promises = [
             promise for promise in user_promises
             if promise.frequency != "once" or promise.status == "active"
@@ -36,11 +63,13 @@ class PromiseProcessor(QueueProcessor[Event]):
             self.log.warning(f"Event {event.id} has no valid timestamp, skipping.")
             return True
 
+        # Get the start_time for the period ending now (or relevant time)
+        # Use datetime.now(timezone.utc) to ensure it's aware. One clock read
+        # covers every promise this event touches.
+        current_time_utc = datetime.now(timezone.utc)
+        promises_to_update = []
         for promise in active_promises:
-            if self._event_matches_promise(event, promise):
-                # Get the start_time for the period ending now (or relevant time)
-                # Use datetime.now(timezone.utc) to ensure it's aware.
-                current_time_utc = datetime.now(timezone.utc)
+            if self._event_matches_promise(event, promise, event_signal):
                 start_time = self._get_start_time(promise, current_time_utc)
 
                 # Compare the event's timestamp (made UTC aware) with the start_time (made UTC aware)
@@ -55,19 +84,47 @@ class PromiseProcessor(QueueProcessor[Event]):
                         # But we could trigger an alert here.
                         self.log.info(f"Negative promise {promise.name} threshold exceeded ({promise.current_count} > {promise.max_allowed})")
                     
-                    self.promise_service.update(promise)
+                    promises_to_update.append(promise)
                     self.log.info(f"Event {event.id} incremented current_count for promise: {promise.name}")
+
+        # Only the counter: the rest of these cached rows may have been edited since they were read.
+        if promises_to_update and not self.promise_service.update_many(
+                promises_to_update, columns=PROMISE_COUNTER_COLUMNS):
+            self._invalidate_user_promises(event.user_id)
         return True
 
-    def _event_matches_promise(self, event: Event, promise: Promise) -> bool:
-        signature = promise_target_signature(promise)
-        return match_signal(
-            signal_event_types=[event.event_type],
-            signal_tags=event.tags or [],
-            target_event_type=signature["target_event_type"],
-            target_tags=signature["target_tags"],
-            tag_match_mode=signature["tag_match_mode"],
-        ).matched
+    def _get_user_promises(self, user_id: int) -> list[Promise]:
+        """Returns the user's promises, reusing a recent lookup when one is still fresh."""
+        return self._get_user_promise_entry(user_id)[1]
+
+    def _get_user_promise_entry(self, user_id: int) -> tuple[float, list[Promise], frozenset[str], frozenset[str]]:
+        now = time.monotonic()
+        if self._promise_changes_seen != PromiseService.changes:
+            self._promise_changes_seen = PromiseService.changes
+            self._user_promises_cache.clear()
+        cached = self._user_promises_cache.get(user_id)
+        if cached and now - cached[0] < self.promise_cache_ttl_sec:
+            return cached
+
+        user_promises = self.promise_service.find_all(filters={"user_id": user_id})
+        referenced_types = set()
+        referenced_tags = set()
+        for promise in user_promises:
+            signature = promise_target_signature(promise)
+            if signature["target_event_type"]:
+                referenced_types.add(signature["target_event_type"])
+            referenced_tags.update(signature["target_tags"])
+
+        entry = (now, user_promises, frozenset(referenced_types), frozenset(referenced_tags))
+        self._user_promises_cache[user_id] = entry
+        return entry
+
+    def _invalidate_user_promises(self, user_id: Optional[int]):
+        self._user_promises_cache.pop(user_id, None)
+
+    def _event_matches_promise(self, event: Event, promise: Promise, event_signal: Optional[tuple] = None) -> bool:
+        event_types, event_tags = event_signal or normalize_event_signal(event.event_type, event.tags)
+        return promise_target_matcher(promise)(event_types, event_tags)
 
     def process(self):
         """Override process to include periodic checks for due promises."""
@@ -76,10 +133,25 @@ class PromiseProcessor(QueueProcessor[Event]):
             if next_item:
                 self.process_item(next_item)
             
-            self._check_due_promises() # This will use datetime.now(timezone.utc) internally
+            self._check_due_promises_if_needed() # This will use datetime.now(timezone.utc) internally
             
             if not next_item:
-                time.sleep(self.sleep_time_sec)
+                self.wait_for_new_items(self.sleep_time_sec)
+        self._close_listener()
+
+    def _check_due_promises_if_needed(self):
+        """Runs the due-promise sweep at most once per due_check_interval_sec."""
+        now = time.monotonic()
+        if now < self._next_due_check_at:
+            return
+        self._next_due_check_at = now + self.due_check_interval_sec
+        try:
+            self._check_due_promises()
+        except Exception as e:
+            # Event rows are streamed during the sweep, so a dropped connection
+            # can surface mid-iteration; skip this sweep rather than end the thread.
+            self.log.exception(e)
+            self.log.warning("Due-promise sweep failed, retrying next interval")
 
     def _check_due_promises(self):
         """Periodically checks for promises that need evaluation."""
@@ -89,16 +161,33 @@ class PromiseProcessor(QueueProcessor[Event]):
             return
 
         self.log.info(f"Checking {len(due_promises)} due promises")
+        promises_by_user: dict[int, list[Promise]] = {}
         for promise in due_promises:
-            # Pass the current UTC time to _evaluate_promise
-            self._evaluate_promise(promise, current_time_utc)
+            promises_by_user.setdefault(promise.user_id, []).append(promise)
+
+        for user_id, user_promises in promises_by_user.items():
+            # One event query covers the periods of all of this user's due promises.
+            signals = self._find_event_signals(user_id, user_promises, current_time_utc)
+            for promise in user_promises:
+                # Pass the current UTC time to _evaluate_promise
+                self._evaluate_promise(promise, current_time_utc, signals)
+
+        # Write the whole sweep back in one round-trip instead of one UPDATE per promise.
+        if not self.promise_service.update_many(due_promises, columns=PROMISE_EVALUATION_COLUMNS):
+            self.log.warning(f"Failed to persist {len(due_promises)} evaluated promises")
+        # The cached copies still carry the old period counters.
+        for user_id in {promise.user_id for promise in due_promises}:
+            self._invalidate_user_promises(user_id)
 
-    def _evaluate_promise(self, promise: Promise, current_time_utc: datetime):
-        """Evaluates a promise based on event counts within its defined period."""
+    def _evaluate_promise(self, promise: Promise, current_time_utc: datetime, signals: Optional[list[tuple]] = None):
+        """Evaluates a promise in place; the caller persists it."""
         end_time = current_time_utc # This is already UTC aware
         start_time = self._get_start_time(promise, end_time)
         
-        event_count = self._count_matching_events(promise, start_time, end_time)
+        if signals is None:
+            event_count = self._count_matching_events(promise, start_time, end_time)
+        else:
+            event_count = self._count_signals(promise, signals, start_time, end_time)
         
         if promise.is_negative:
             # Negative promise: Success if count is within max_allowed
@@ -127,8 +216,6 @@ class PromiseProcessor(QueueProcessor[Event]):
         promise.current_count = 0
         promise.last_checked_at = end_time # Store UTC aware time
         promise.next_check_at = self._calculate_next_check(promise, end_time)
-        
-        self.promise_service.update(promise)
 
     def _get_start_time(self, promise: Promise, end_time: datetime) -> datetime:
         """Calculates the start time of the period for the promise, ensuring it's UTC aware."""
@@ -144,12 +231,9 @@ class PromiseProcessor(QueueProcessor[Event]):
             return last_checked
         
         # Fallback based on frequency using end_time (which is UTC aware)
-        if promise.frequency == "daily":
-            return end_time - timedelta(days=1)
-        elif promise.frequency == "weekly":
-            return end_time - timedelta(weeks=1)
-        elif promise.frequency == "monthly":
-            return end_time - timedelta(days=30) # Approximation
+        period = PERIOD_BY_FREQUENCY.get(promise.frequency)
+        if period is not None:
+            return end_time - period
         
         # Handle created_at similarly. It might be naive if loaded from DB.
         created_at = promise.created_at
@@ -162,13 +246,7 @@ class PromiseProcessor(QueueProcessor[Event]):
     def _calculate_next_check(self, promise: Promise, last_check: datetime) -> datetime:
         """Calculates the next check time, ensuring it's UTC aware."""
         # last_check is expected to be UTC aware.
-        if promise.frequency == "daily":
-            return last_check + timedelta(days=1)
-        elif promise.frequency == "weekly":
-            return last_check + timedelta(weeks=1)
-        elif promise.frequency == "monthly":
-            return last_check + timedelta(days=30)
-        return last_check + timedelta(days=36500) # For 'once', effectively never again
+        return last_check + PERIOD_BY_FREQUENCY.get(promise.frequency, ONCE_RECHECK_PERIOD)
 
     def _count_matching_events(self, promise: Promise, start_time: datetime, end_time: datetime) -> int:
         """Counts events within the specified UTC aware time window."""
@@ -177,24 +255,56 @@ class PromiseProcessor(QueueProcessor[Event]):
         filters = {
             "timestamp": {"$gt": start_time, "$lt": end_time}
         }
-        if promise.target_event_type and not promise.target_event_type.startswith("project:"):
-            filters["event_type"] = promise.target_event_type
+        event_type = self._exact_event_type(promise)
+        if event_type:
+            filters["event_type"] = event_type
         
         # Fetch events. `event.timestamp` needs to be made consistent.
         filters["user_id"] = promise.user_id
         events = self.event_service.find_all(filters=filters)
-        
-        count = 0
+        return self._count_signals(promise, self._to_event_signals(events), start_time, end_time)
+
+    def _find_event_signals(self, user_id: int, promises: list[Promise], end_time: datetime) -> list[tuple]:
+        """Fetches the user's events for the widest period among the given promises."""
+        start_time = min(self._get_start_time(promise, end_time) for promise in promises)
+        filters = {
+            "user_id": user_id,
+            "timestamp": {"$gt": start_time, "$lt": end_time},
+        }
+        event_types = {self._exact_event_type(promise) for promise in promises}
+        if None not in event_types:
+            # Every promise names its event type, so the query can stay narrow.
+            filters["event_type"] = {"$in": sorted(event_types)}
+        # Monthly periods can span a lot of events; stream them straight into signals.
+        return self._to_event_signals(self.event_service.iter_all(filters=filters))
+
+    def _to_event_signals(self, events: Iterable[Event]) -> list[tuple]:
+        """Normalizes each event once into (UTC aware timestamp, event types, tags)."""
+        signals = []
         for e in events:
             # Ensure event.timestamp is UTC aware for comparison.
             event_ts_aware = self._make_datetime_utc_aware(e.timestamp)
-            
+            if event_ts_aware:
+                signals.append((event_ts_aware, *normalize_event_signal(e.event_type, e.tags)))
+        return signals
+
+    @staticmethod
+    def _count_signals(promise: Promise, signals: list[tuple], start_time: datetime, end_time: datetime) -> int:
+        matches_promise = promise_target_matcher(promise)
+        count = 0
+        for event_ts_aware, event_types, event_tags in signals:
             # Compare UTC aware datetimes.
-            if event_ts_aware and event_ts_aware > start_time and event_ts_aware < end_time:
-                if self._event_matches_promise(e, promise):
-                    count += 1
+            if start_time < event_ts_aware < end_time and matches_promise(event_types, event_tags):
+                count += 1
         return count
 
+    @staticmethod
+    def _exact_event_type(promise: Promise) -> Optional[str]:
+        """The event type the events query can filter on, if the promise pins one."""
+        if promise.target_event_type and not promise.target_event_type.startswith("project:"):
+            return promise.target_event_type
+        return None
+
     def _make_datetime_utc_aware(self, dt: Optional[datetime]) -> Optional[datetime]:
         """Helper to convert a datetime object to UTC aware. If naive, assumes UTC and makes it aware."""
         if dt is None:
@@ -6,7 +6,7 @@ from typing import Optional
 
 from gabru.qprocessor.qprocessor import QueueProcessor
 from model.event import Event
-from services.eventing import emit_event_safely
+from services.eventing import emit_event_in_background
 from services.events import EventService
 
 
@@ -181,7 +181,8 @@ class SessionInferenceProcessor(QueueProcessor[Event]):
         description = f"{session_type.title()} session {action}ed"
         if action == "end" and duration_minutes is not None:
             description = f"{session_type.title()} session ended after {duration_minutes} minute(s)"
-        emit_event_safely(
+        # Boundary events are informational; keep the insert off the event loop.
+        emit_event_in_background(
             self.log,
             user_id=user_id,
             event_type=f"{session_type}:session:{action}",
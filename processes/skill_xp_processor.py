@@ -1,13 +1,19 @@
+import time
 from datetime import datetime
 from typing import Optional
 
 from gabru.qprocessor.qprocessor import QueueProcessor
 from model.event import Event
+from model.skill import Skill
 from model.skill_level_history import SkillLevelHistory
 from services.events import EventService
 from services.skill_level_history import SkillLevelHistoryService
 from services.skills import SkillService
 
+LEVEL_UP_TAGS = ("notification", "notification_class:today", "skill", "level_up")
+# Level is derived from total_xp, so it is the only column written back here.
+LEVEL_COLUMNS = ["level"]
+
 
 class SkillXPProcessor(QueueProcessor[Event]):
     def __init__(self, xp_per_match: int = 20, **kwargs):
@@ -16,6 +22,11 @@ class SkillXPProcessor(QueueProcessor[Event]):
         self.skill_history_service = SkillLevelHistoryService()
         self.xp_per_match = xp_per_match
         super().__init__(service=self.event_service, **kwargs)
+        # Tagged events tend to arrive in bursts for one user; reuse that
+        # user's skills and their match keys for a couple of seconds.
+        self.skill_cache_ttl_sec = 2
+        self._user_skills_cache: dict[int, tuple[float, list[tuple[Skill, set[str]]]]] = {}
+        self._skill_changes_seen = SkillService.changes
 
     def filter_item(self, event: Event) -> Optional[Event]:
         if event.event_type == "skill:level_up":
@@ -34,24 +45,32 @@ class SkillXPProcessor(QueueProcessor[Event]):
         if not normalized_tags:
             return True
 
-        skills = self.skill_service.find_all(filters={"user_id": event.user_id})
-        if not skills:
+        indexed_skills = self._get_user_skills(event.user_id)
+        if not indexed_skills:
             return True
 
         matched_skills = [
-            skill for skill in skills
-            if self.skill_service.get_match_keys(skill).intersection(normalized_tags)
+            skill for skill, match_keys in indexed_skills
+            if not match_keys.isdisjoint(normalized_tags)
         ]
         if not matched_skills:
             return True
 
+        new_totals = self.skill_service.add_xp([skill.id for skill in matched_skills], self.xp_per_match)
+        if not new_totals:
+            self._user_skills_cache.pop(event.user_id, None)
+            return True
+
+        leveled_skills = []
         for skill in matched_skills:
-            old_level = self.skill_service.derive_level(skill.total_xp)
-            skill.total_xp += self.xp_per_match
+            if skill.id not in new_totals:
+                continue
+            skill.total_xp = new_totals[skill.id]
+            old_level = self.skill_service.derive_level(skill.total_xp - self.xp_per_match)
             skill.level = self.skill_service.derive_level(skill.total_xp)
-            self.skill_service.update(skill)
 
             if skill.level > old_level:
+                leveled_skills.append(skill)
                 self._record_level_ups(skill, old_level, event.timestamp or datetime.now())
 
             self.log.info(
@@ -59,12 +78,33 @@ class SkillXPProcessor(QueueProcessor[Event]):
                 f"New total: {skill.total_xp}, level: {skill.level}"
             )
 
+        if leveled_skills and not self.skill_service.update_many(leveled_skills, columns=LEVEL_COLUMNS):
+            self._user_skills_cache.pop(event.user_id, None)
+
         return True
 
+    def _get_user_skills(self, user_id: int) -> list[tuple[Skill, set[str]]]:
+        """Returns (skill, match keys) pairs for the user, reusing a fresh lookup when possible."""
+        now = time.monotonic()
+        if self._skill_changes_seen != SkillService.changes:
+            self._skill_changes_seen = SkillService.changes
+            self._user_skills_cache.clear()
+        cached = self._user_skills_cache.get(user_id)
+        if cached and now - cached[0] < self.skill_cache_ttl_sec:
+            return cached[1]
+
+        skills = self.skill_service.find_all(filters={"user_id": user_id})
+        indexed_skills = [(skill, self.skill_service.get_match_keys(skill)) for skill in skills]
+        self._user_skills_cache[user_id] = (now, indexed_skills)
+        return indexed_skills
+
     def _record_level_ups(self, skill, old_level: int, reached_at: datetime):
+        skill_tag = f"skill:{self.skill_service.normalize_skill_tag(skill.tag_key or skill.name)}"
+        history_items = []
+        level_up_events = []
         for new_level in range(old_level + 1, skill.level + 1):
             summary = f"Reached Level {new_level} in {skill.name}"
-            history_item = SkillLevelHistory(
+            history_items.append(SkillLevelHistory(
                 user_id=skill.user_id,
                 skill_id=skill.id,
                 skill_name=skill.name,
@@ -72,21 +112,15 @@ class SkillXPProcessor(QueueProcessor[Event]):
                 total_xp=skill.total_xp,
                 reached_at=reached_at,
                 summary=summary,
-            )
-            self.skill_history_service.create(history_item)
-
-            level_up_event = Event(
+            ))
+            level_up_events.append(Event(
                 user_id=skill.user_id,
                 event_type="skill:level_up",
                 timestamp=reached_at,
                 description=summary,
-                tags=[
-                    "notification",
-                    "notification_class:today",
-                    "skill",
-                    "level_up",
-                    f"skill:{self.skill_service.normalize_skill_tag(skill.tag_key or skill.name)}",
-                    f"skill:level:{new_level}",
-                ],
-            )
-            self.event_service.create(level_up_event)
+                tags=[*LEVEL_UP_TAGS, skill_tag, f"skill:level:{new_level}"],
+            ))
+
+        # A big XP award can cross several levels; write each kind in one round-trip.
+        self.skill_history_service.create_many(history_items)
+        self.event_service.create_many(level_up_events)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from services.events import EventService
+from services.notifications import NotificationService
+from services.thoughts import ThoughtService
+
+
+def migrate_serial_id(service) -> None:
+    """
+    Turns a 32-bit SERIAL id column into BIGINT GENERATED BY DEFAULT AS IDENTITY,
+    keeping the existing ids and continuing the sequence after the highest one.
+    """
+    table = service.table_name
+    conn = service.db.get_conn()
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT is_identity FROM information_schema.columns WHERE table_name = %s AND column_name = 'id'",
+            (table,),
+        )
+        row = cursor.fetchone()
+        if not row or row[0] == "YES":
+            print(f"skip {table}: id is already an identity column")
+            return
+
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", (table,))
+        sequence = cursor.fetchone()[0]
+        # Connections run in autocommit; keep the switch in one transaction.
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
+            if sequence:
+                cursor.execute(f"DROP SEQUENCE {sequence}")
+            cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id TYPE BIGINT")
+            cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+            )
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+    print(f"{table}: id is now BIGINT GENERATED BY DEFAULT AS IDENTITY")
+
+
+def tune_event_partitions(service: EventService) -> None:
+    """Applies the autovacuum setting new partitions get to the ones that already exist."""
+    conn = service.db.get_conn()
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = 'events'::regclass")
+        partitions = [row[0] for row in cursor.fetchall()]
+        for partition in partitions:
+            cursor.execute(
+                f"ALTER TABLE {partition} SET (autovacuum_vacuum_scale_factor = "
+                f"{service.partition_autovacuum_scale_factor})"
+            )
+    print(f"events: tuned autovacuum on {len(partitions)} partition(s)")
+
+
+def main() -> None:
+    load_dotenv(Path(".env"), override=False)
+
+    for service in (NotificationService(), ThoughtService()):
+        migrate_serial_id(service)
+    tune_event_partitions(EventService())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import os
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 from urllib.parse import quote
 from zipfile import ZIP_DEFLATED, ZipFile
@@ -39,6 +40,35 @@ from services.docs import DocsService
 
 basedir = os.path.dirname(__file__)
 
+DATETIME_FORMAT = "%b %d, %Y %H:%M"
+PROJECT_DATETIME_FORMAT = "%b %d, %Y, %I:%M %p"
+
+
+def _format_datetime_value(value, fmt: str):
+    if isinstance(value, datetime):
+        # The zone is part of the key so equal instants in different zones
+        # do not share a rendering.
+        return _format_datetime_cached(value, value.tzinfo, fmt)
+    return _format_datetime_cached(value, None, fmt)
+
+
+# List pages render the same handful of timestamps over and over.
+@lru_cache(maxsize=4096)
+def _format_datetime_cached(value, _tzinfo, fmt: str):
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, (int, float)):
+        parsed = datetime.fromtimestamp(value)
+    elif isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", ""))
+        except Exception:
+            return value
+    else:
+        parsed = value
+    formatted = parsed.strftime(fmt)
+    return formatted.replace(" 0", " ").replace(" 00:", " 12:")
+
 
 class RasbhariServer(Server):
     def __init__(self):
@@ -58,30 +88,17 @@ class RasbhariServer(Server):
         self.open_webui_url = os.getenv('OPEN_WEBUI_URL')
 
     def setup_datetime_filter(self):
-        def _format_datetime_value(value, fmt: str):
-            if isinstance(value, (int, float)):
-                parsed = datetime.fromtimestamp(value)
-            elif isinstance(value, str):
-                try:
-                    parsed = datetime.fromisoformat(value.replace("Z", ""))
-                except Exception:
-                    return value
-            else:
-                parsed = value
-            formatted = parsed.strftime(fmt)
-            return formatted.replace(" 0", " ").replace(" 00:", " 12:")
-
         @self.app.template_filter("datetimeformat")
         def datetimeformat(value):
             try:
-                return _format_datetime_value(value, "%b %d, %Y %H:%M")
+                return _format_datetime_value(value, DATETIME_FORMAT)
             except Exception as _:
                 return value
 
         @self.app.template_filter("projectdatetimeformat")
         def projectdatetimeformat(value):
             try:
-                return _format_datetime_value(value, "%b %d, %Y, %I:%M %p")
+                return _format_datetime_value(value, PROJECT_DATETIME_FORMAT)
             except Exception as _:
                 return value
 
@@ -106,7 +106,8 @@ class DeviceService(CRUDService[Device]):
         if not conn:
             return []
         with conn.cursor() as cursor:
-            query = "SELECT * FROM devices WHERE  enabled = TRUE AND %s = ANY(string_to_array(authorized_apps, ','))"
+            columns = ", ".join(self._get_columns_for_select())
+            query = f"SELECT {columns} FROM devices WHERE enabled = TRUE AND %s = ANY(string_to_array(authorized_apps, ','))"
             cursor.execute(query, (key,))
             rows = cursor.fetchall()
             devices = [self._to_object(row) for row in rows]
@@ -4,6 +4,11 @@ import html
 import re
 from pathlib import Path
 
+NUMBERED_ITEM_PATTERN = re.compile(r"^\d+\.\s+(.*)$")
+INLINE_CODE_PATTERN = re.compile(r"`([^`]+)`")
+INLINE_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+INLINE_STRONG_PATTERN = re.compile(r"\*\*([^*]+)\*\*")
+
 
 class DocsService:
     def __init__(self, docs_root: str):
@@ -124,7 +129,7 @@ class DocsService:
                 output.append(f"<li>{self._inline(marker[2:].strip())}</li>")
                 continue
 
-            numbered = re.match(r"^\d+\.\s+(.*)$", marker)
+            numbered = NUMBERED_ITEM_PATTERN.match(marker)
             if numbered:
                 flush_paragraph()
                 if not in_list:
@@ -145,7 +150,7 @@ class DocsService:
     @staticmethod
     def _inline(text: str) -> str:
         escaped = html.escape(text)
-        escaped = re.sub(r"`([^`]+)`", r"<code>\1</code>", escaped)
-        escaped = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2">\1</a>', escaped)
-        escaped = re.sub(r"\*\*([^*]+)\*\*", r"<strong>\1</strong>", escaped)
+        escaped = INLINE_CODE_PATTERN.sub(r"<code>\1</code>", escaped)
+        escaped = INLINE_LINK_PATTERN.sub(r'<a href="\2">\1</a>', escaped)
+        escaped = INLINE_STRONG_PATTERN.sub(r"<strong>\1</strong>", escaped)
         return escaped
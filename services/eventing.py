@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import atexit
+import queue
+import threading
 from typing import Any, Optional
 
 from model.event import Event
@@ -8,6 +11,11 @@ from services.events import EventService
 
 _event_service: Optional[EventService] = None
 
+# (log, event) pairs waiting for the background writer
+_background_events: "queue.Queue[tuple[Any, Event]]" = queue.Queue()
+_background_writer: Optional[threading.Thread] = None
+_background_writer_lock = threading.Lock()
+
 
 def get_event_service() -> EventService:
     global _event_service
@@ -23,3 +31,64 @@ def emit_event_safely(log, **event_data: Any) -> Optional[int]:
         event_type = event_data.get("event_type", "unknown")
         log.warning("Failed to emit event %s: %s", event_type, exc)
         return None
+
+
+def emit_event_in_background(log, **event_data: Any) -> bool:
+    """
+    Queues an informational event for a background writer instead of inserting
+    it on the caller's thread; events queued close together are written with a
+    single create_many. Meant for processors that do not need the new id. The
+    writer runs outside any request, so event_data must carry its own user_id.
+    """
+    try:
+        event = Event(**event_data)
+    except Exception as exc:
+        log.warning("Failed to emit event %s: %s", event_data.get("event_type", "unknown"), exc)
+        return False
+    _ensure_background_writer()
+    _background_events.put((log, event))
+    return True
+
+
+def _ensure_background_writer():
+    global _background_writer
+    with _background_writer_lock:
+        if _background_writer is not None:
+            return
+        _background_writer = threading.Thread(target=_run_background_writer, name="EventWriter", daemon=True)
+        _background_writer.start()
+        atexit.register(flush_background_events)
+
+
+def _run_background_writer():
+    while True:
+        batch = [_background_events.get()]
+        batch.extend(_drain_background_events())
+        _write_background_batch(batch)
+
+
+def _drain_background_events() -> list[tuple[Any, Event]]:
+    batch = []
+    while True:
+        try:
+            batch.append(_background_events.get_nowait())
+        except queue.Empty:
+            return batch
+
+
+def flush_background_events():
+    """Writes whatever is still queued on the calling thread, e.g. at shutdown."""
+    batch = _drain_background_events()
+    if batch:
+        _write_background_batch(batch)
+
+
+def _write_background_batch(batch: list[tuple[Any, Event]]):
+    try:
+        created_ids = get_event_service().create_many([event for _, event in batch])
+    except Exception as exc:
+        created_ids = []
+        batch[0][0].warning("Background event write failed: %s", exc)
+    if len(created_ids) != len(batch):
+        for log, event in batch:
+            log.warning("Failed to emit event %s in background", event.event_type)
@@ -1,5 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
 import json
+import sys
 
 from model.event import Event
 from gabru.db.service import CRUDService
@@ -8,6 +9,15 @@ from typing import List, Optional
 
 
 class EventService(CRUDService[Event]):
+    notify_channel = "events_inserted"
+    # Monthly child partitions are kept this many months ahead of today.
+    partition_months_ahead = 2
+    # Partitions are append-only and large, so vacuum after 2% churn instead
+    # of the default 20%.
+    partition_autovacuum_scale_factor = 0.02
+    # Month the partitions were last extended from, shared by all instances.
+    _partitioned_month: Optional[tuple[int, int]] = None
+
     def __init__(self):
         super().__init__(
             "events", DB("events"), user_scoped=True
@@ -28,50 +38,179 @@ class EventService(CRUDService[Event]):
                             ) PARTITION BY RANGE (timestamp)
                         """)
                 cursor.execute("ALTER TABLE events ADD COLUMN IF NOT EXISTS payload JSONB NOT NULL DEFAULT '{}'::jsonb")
-                cursor.execute("""
+                cursor.execute(f"""
                             CREATE TABLE IF NOT EXISTS events_default
                                 PARTITION OF events DEFAULT
+                                WITH (autovacuum_vacuum_scale_factor = {self.partition_autovacuum_scale_factor})
                         """)
                 cursor.execute("""
                             CREATE INDEX IF NOT EXISTS events_id_idx ON events (id)
                         """)
+                # Earlier (event_type, timestamp DESC) and tags GIN indexes had no
+                # reader and only slowed inserts; remove them where they were built.
+                cursor.execute("DROP INDEX IF EXISTS events_type_ts_desc_idx")
+                cursor.execute("DROP INDEX IF EXISTS events_tags_gin")
+                # Events arrive in time order, so a BRIN index covers time-window
+                # scans at a fraction of a btree's size.
+                cursor.execute("""
+                            CREATE INDEX IF NOT EXISTS events_ts_brin_idx ON events
+                                USING BRIN (timestamp) WITH (pages_per_range = 32)
+                        """)
+                # Wake queue processors on insert instead of having each one poll.
+                # Statement-level, so a bulk insert raises a single notification.
+                cursor.execute("""
+                            CREATE OR REPLACE FUNCTION notify_events_inserted() RETURNS trigger AS $$
+                            BEGIN
+                                PERFORM pg_notify('events_inserted', '');
+                                RETURN NULL;
+                            END;
+                            $$ LANGUAGE plpgsql
+                        """)
+                cursor.execute("""
+                            DO $$
+                            BEGIN
+                                IF NOT EXISTS (
+                                    SELECT 1 FROM pg_trigger
+                                    WHERE tgname = 'events_notify_inserted' AND tgrelid = 'events'::regclass
+                                ) THEN
+                                    CREATE TRIGGER events_notify_inserted
+                                        AFTER INSERT ON events
+                                        FOR EACH STATEMENT EXECUTE FUNCTION notify_events_inserted();
+                                END IF;
+                            END
+                            $$
+                        """)
                 self.db.conn.commit()
+        self._use_lz4_compression()
+        self._ensure_monthly_partitions()
+
+    def _use_lz4_compression(self):
+        """
+        Switches the columns that can grow past the TOAST threshold to LZ4,
+        which compresses and decompresses much faster than the default pglz.
+        Only new values are written with it. Servers older than Postgres 14,
+        or built without lz4, keep pglz.
+        """
+        conn = self.db.conn
+        if not conn:
+            return
+        with conn.cursor() as cursor:
+            try:
+                cursor.execute("""
+                    SELECT attname FROM pg_attribute
+                    WHERE attrelid = 'events'::regclass
+                      AND attname IN ('description', 'payload')
+                      AND attcompression <> 'l'
+                """)
+                for (column,) in cursor.fetchall():
+                    cursor.execute(f"ALTER TABLE events ALTER COLUMN {column} SET COMPRESSION lz4")
+            except Exception as e:
+                self.db.rollback_quietly()
+                self.log.warning("Could not switch events to lz4 compression: %s", e)
+
+    def _ensure_monthly_partitions(self, today: Optional[date] = None):
+        """
+        Creates one child partition per month from the current month through
+        partition_months_ahead months out, so time-window queries only scan the
+        months they touch. Anything outside those ranges keeps landing in
+        events_default.
+
+        A month that already has rows in events_default is left there: attaching
+        a partition over it would scan and lock events_default only to fail, and
+        it would do so again on every start.
+
+        Runs only at startup, never on the insert path: creating a partition
+        scans events_default under an ACCESS EXCLUSIVE lock. A process that stays
+        up past the covered months simply writes the newer months into
+        events_default until its next start.
+        """
+        today = today or date.today()
+        month = (today.year, today.month)
+        if EventService._partitioned_month == month:
+            return
+        conn = self.db.conn
+        if not conn:
+            return
+
+        start = today.replace(day=1)
+        with conn.cursor() as cursor:
+            for _ in range(self.partition_months_ahead + 1):
+                end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+                partition = f"events_y{start.year}m{start.month:02d}"
+                try:
+                    cursor.execute("SELECT to_regclass(%s)", (partition,))
+                    if cursor.fetchone()[0] is None:
+                        cursor.execute(
+                            "SELECT 1 FROM events_default WHERE timestamp >= %s AND timestamp < %s LIMIT 1",
+                            (start, end),
+                        )
+                        if cursor.fetchone():
+                            self.log.info("Keeping %s-%02d in events_default; it already holds rows for that month",
+                                          start.year, start.month)
+                        else:
+                            cursor.execute(
+                                f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF events "
+                                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}') "
+                                f"WITH (autovacuum_vacuum_scale_factor = {self.partition_autovacuum_scale_factor})"
+                            )
+                except Exception as e:
+                    # e.g. a row for that month landed in events_default between
+                    # the check and the CREATE; it simply stays there.
+                    self.db.rollback_quietly()
+                    self.log.warning("Could not create partition %s: %s", partition, e)
+                start = end
+        EventService._partitioned_month = month
 
     def find_by_event_type_and_time_range(self, event_types: List[str], max_timestamp: int, min_timestamp: int) -> List[
         Event]:
         """Finds all events of the specified types within a given time range."""
-        filters = {
-            "event_type": {"$in": event_types},
-            "timestamp": {"$lt": datetime.fromtimestamp(max_timestamp), "$gt": datetime.fromtimestamp(min_timestamp)}
-        }
-        sort_by = {"timestamp": "ASC"}
-        return self.find_all(filters=filters, sort_by=sort_by)
+        # Written out directly rather than through find_all's filter dict: the
+        # types go over as one array parameter and the bounds are fixed.
+        columns = ", ".join(self._get_columns_for_select())
+        query = f"SELECT {columns} FROM events WHERE event_type = ANY(%s) AND timestamp > %s AND timestamp < %s"
+        params = [list(event_types), datetime.fromtimestamp(min_timestamp), datetime.fromtimestamp(max_timestamp)]
+        user_scope = self._get_request_user_scope()
+        if user_scope is not None:
+            query += f" AND {self.user_scope_column} = %s"
+            params.append(user_scope)
+        query += " ORDER BY timestamp ASC"
+
+        def operation(conn):
+            with conn.cursor() as cursor:
+                cursor.execute(query, tuple(params))
+                return [self._to_object(row) for row in cursor.fetchall()]
+
+        return self._run_with_connection_retry(operation, fallback=[], action_name="find_by_event_type_and_time_range on events")
 
     def find_latest_event_before(self, event_type: str, max_timestamp: int) -> Optional[Event]:
         """
         Finds the single latest event of a specific type that occurred strictly before max_timestamp.
         This is optimized for the 'SINCE' logic.
 
-        NOTE: Assuming the timestamp is stored as an integer epoch time or is handled appropriately
-              by the underlying database layer when compared to the integer max_timestamp.
+        NOTE: max_timestamp is an epoch time, converted the same way as in
+              find_by_event_type_and_time_range.
         """
-        try:
-            with self.db.conn.cursor() as cursor:
-                # Selects the most recent event (DESC) of the given type that is older than max_timestamp (the trigger time)
-                query = """
-                    SELECT * FROM events
-                    WHERE event_type = %s AND timestamp < %s
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                """
-                cursor.execute(query, (event_type, max_timestamp))
+        columns = ", ".join(self._get_columns_for_select())
+        # Selects the most recent event (DESC) of the given type that is older than max_timestamp (the trigger time)
+        query = f"SELECT {columns} FROM events WHERE event_type = %s AND timestamp < %s"
+        params = [event_type, datetime.fromtimestamp(max_timestamp)]
+        user_scope = self._get_request_user_scope()
+        if user_scope is not None:
+            query += f" AND {self.user_scope_column} = %s"
+            params.append(user_scope)
+        query += " ORDER BY timestamp DESC LIMIT 1"
+
+        def operation(conn):
+            with conn.cursor() as cursor:
+                cursor.execute(query, tuple(params))
                 row = cursor.fetchone()
+                return self._to_object(row) if row else None
 
-                if row:
-                    return self._to_object(row)
-                return None
+        try:
+            return self._run_with_connection_retry(operation, fallback=None, action_name="find_latest_event_before on events")
         except Exception as e:
-            # self.log.error(f"Error finding latest event: {e}")
+            self.db.rollback_quietly()
+            self.log.warning("find_latest_event_before failed for %s: %s", event_type, e)
             return None
 
     def _to_tuple(self, event: Event) -> tuple:
@@ -79,16 +218,20 @@ class EventService(CRUDService[Event]):
             event.user_id, event.event_type, event.timestamp, event.description, event.tags, json.dumps(event.payload or {}, ensure_ascii=True))
 
     def _to_object(self, row: tuple) -> Event:
-        event_dict = {
-            "id": row[0],
-            "user_id": row[1],
-            "event_type": row[2],
-            "timestamp": row[3],
-            "description": row[4],
-            "tags": row[5] if row[5] else [],
-            "payload": row[6] or {},
-        }
-        return Event(**event_dict)
+        # Rows were validated on the way in and the column types already match
+        # the model, so skip pydantic validation; this runs for every row of
+        # every event scan. Event types and tags come from a small vocabulary
+        # repeated across thousands of rows, so share one string object per
+        # distinct value.
+        return Event.model_construct(
+            id=row[0],
+            user_id=row[1],
+            event_type=sys.intern(row[2]) if row[2] else row[2],
+            timestamp=row[3],
+            description=row[4],
+            tags=[sys.intern(tag) if isinstance(tag, str) else tag for tag in row[5]] if row[5] else [],
+            payload=row[6] or {},
+        )
 
     def _get_columns_for_insert(self) -> List[str]:
         return ["user_id", "event_type", "timestamp", "description", "tags", "payload"]
@@ -78,6 +78,7 @@ class ImportPipelineService:
         first = records[0]
         result = ImportBatchResult(source_type=first.source_type, source_name=first.source_name, fetched=len(records))
 
+        imported_records = []
         for item in records:
             record = self._to_import_record(user_id=user_id, item=item)
             if self._already_imported(record):
@@ -91,16 +92,30 @@ class ImportPipelineService:
 
             result.imported += 1
             record.id = created_id
-            if emit_events:
-                event = self._to_event(user_id=user_id, record=record)
-                event_id = self.event_service.create(event)
-                if event_id:
-                    result.emitted_events += 1
-                    record.imported_event_id = event_id
-                    self.import_record_service.update(record)
+            imported_records.append(record)
+
+        if emit_events and imported_records:
+            self._emit_import_events(user_id=user_id, records=imported_records, result=result)
 
         return result
 
+    def _emit_import_events(self, *, user_id: int, records: list[ImportRecord], result: ImportBatchResult) -> None:
+        # Imports arrive in bulk; insert their events together and link them back in one batch.
+        events = [self._to_event(user_id=user_id, record=record) for record in records]
+        event_ids = self.event_service.create_many(events)
+        if len(event_ids) != len(records):
+            # The batch insert is all-or-nothing; retry row by row so one bad event doesn't drop the rest.
+            event_ids = [self.event_service.create(event) for event in events]
+        linked_records = []
+        for record, event_id in zip(records, event_ids):
+            if event_id:
+                record.imported_event_id = event_id
+                linked_records.append(record)
+        if not linked_records:
+            return
+        result.emitted_events += len(linked_records)
+        self.import_record_service.update_many(linked_records)
+
     def _already_imported(self, record: ImportRecord) -> bool:
         if record.external_id:
             existing = self.import_record_service.get_by_source_key(
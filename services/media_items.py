@@ -185,8 +185,9 @@ class MediaItemService(CRUDService[MediaItem]):
         item.progress_seconds = max(0, int(progress_seconds or 0))
         item.duration_seconds = max(item.duration_seconds or 0, int(duration_seconds or 0))
         item.is_playing = bool(is_playing)
-        item.playback_heartbeat_at = datetime.now()
-        item.last_watched_at = datetime.now()
+        now = datetime.now()
+        item.playback_heartbeat_at = now
+        item.last_watched_at = now
         return self.update(item)
 
     def mark_watch_started(self, item_id: int, restart: bool = False) -> Optional[MediaItem]:
@@ -196,8 +197,9 @@ class MediaItemService(CRUDService[MediaItem]):
         if restart:
             item.progress_seconds = 0
         item.is_playing = True
-        item.playback_heartbeat_at = datetime.now()
-        item.last_watched_at = datetime.now()
+        now = datetime.now()
+        item.playback_heartbeat_at = now
+        item.last_watched_at = now
         return item if self.update(item) else None
 
     def mark_playback_stopped(self, item_id: int) -> bool:
@@ -17,7 +17,7 @@ class NotificationService(CRUDService[Notification]):
             with self.db.conn.cursor() as cursor:
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS notifications (
-                        id SERIAL PRIMARY KEY,
+                        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
                         user_id INTEGER,
                         title VARCHAR(255),
                         notification_type VARCHAR(255) NOT NULL,
@@ -51,18 +51,19 @@ class NotificationService(CRUDService[Notification]):
         )
 
     def _to_object(self, row: tuple) -> Notification:
-        notification_dict = {
-            "id": row[0],
-            "user_id": row[1],
-            "title": row[2],
-            "notification_type": row[3],
-            "notification_class": row[4],
-            "notification_data": row[5],
-            "href": row[6],
-            "is_read": row[7],
-            "created_at": row[8],
-        }
-        return Notification(**notification_dict)
+        # Columns come back in _get_columns_for_select order with model types,
+        # so build the model without re-validating every row.
+        return Notification.model_construct(
+            id=row[0],
+            user_id=row[1],
+            title=row[2],
+            notification_type=row[3],
+            notification_class=row[4],
+            notification_data=row[5],
+            href=row[6],
+            is_read=row[7],
+            created_at=row[8],
+        )
 
     def _get_columns_for_insert(self) -> List[str]:
         return ["user_id", "title", "notification_type", "notification_class", "notification_data", "href", "is_read", "created_at"]
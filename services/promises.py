@@ -2,11 +2,23 @@ from datetime import datetime
 from model.promise import Promise
 from gabru.db.service import CRUDService
 from gabru.db.db import DB
+from services.signal_matching import promise_target_signature
 from typing import List, Optional
 import json
 
 
+# Columns PromiseProcessor writes after counting an event / evaluating a period.
+PROMISE_COUNTER_COLUMNS = ["current_count"]
+PROMISE_EVALUATION_COLUMNS = ["status", "current_count", "streak", "best_streak", "total_completions",
+                              "total_periods", "last_checked_at", "next_check_at"]
+
+
 class PromiseService(CRUDService[Promise]):
+    # Bumped on every create/update/delete through any instance, so
+    # PromiseProcessor can drop its short-lived per-user copies when promises
+    # change elsewhere in the process.
+    changes = 0
+
     def __init__(self):
         super().__init__(
             "promises", DB("rasbhari"), user_scoped=True
@@ -41,8 +53,25 @@ class PromiseService(CRUDService[Promise]):
                         """)
                 cursor.execute("ALTER TABLE promises ADD COLUMN IF NOT EXISTS target_event_tags TEXT")
                 cursor.execute("ALTER TABLE promises ADD COLUMN IF NOT EXISTS target_event_tags_match_mode VARCHAR(10) DEFAULT 'any'")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_promises_user ON promises(user_id)")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_promises_next_check ON promises(next_check_at)")
                 self.db.conn.commit()
 
+    def create(self, obj: Promise) -> Optional[int]:
+        promise_id = super().create(obj)
+        PromiseService.changes += 1
+        return promise_id
+
+    def update(self, obj: Promise) -> bool:
+        updated = super().update(obj)
+        PromiseService.changes += 1
+        return updated
+
+    def delete(self, obj_id: int) -> bool:
+        deleted = super().delete(obj_id)
+        PromiseService.changes += 1
+        return deleted
+
     def get_due_promises(self) -> List[Promise]:
         """Finds all promises that need checking (next_check_at <= now)."""
         filters = {
@@ -95,7 +124,10 @@ class PromiseService(CRUDService[Promise]):
             "created_at": row[20],
             "updated_at": row[21]
         }
-        return Promise(**promise_dict)
+        promise = Promise(**promise_dict)
+        # Normalize the match target once on load instead of per matched event.
+        promise_target_signature(promise)
+        return promise
 
     @staticmethod
     def _normalize_tags(tags: Optional[List[str]], legacy_tag: Optional[str] = None) -> List[str]:
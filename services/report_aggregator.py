@@ -32,6 +32,8 @@ POSITIVE_THOUGHT_MARKERS = {
 WORK_TAG_MARKERS = {
     "work", "career", "job", "coding", "build", "project", "deepwork", "study"
 }
+NON_ALNUM_PATTERN = re.compile(r"[^a-z0-9]+")
+LOOP_MARKER_PATTERN = re.compile(r"(start|begin|open|resume|finish|complete|done|closed)")
 
 
 @dataclass
@@ -529,8 +531,8 @@ class ReportAggregator:
         }
 
     def _normalize_key(self, value: Optional[str]) -> str:
-        return re.sub(r"[^a-z0-9]+", "", (value or "").strip().lower())
+        return NON_ALNUM_PATTERN.sub("", (value or "").strip().lower())
 
     def _normalize_loop_key(self, value: str) -> str:
-        value = re.sub(r"(start|begin|open|resume|finish|complete|done|closed)", "", value)
+        value = LOOP_MARKER_PATTERN.sub("", value)
         return self._normalize_key(value)
@@ -1,10 +1,11 @@
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
 
 from model.promise import Promise
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SignalMatchResult:
     matched: bool
     matched_tags: tuple[str, ...] = ()
@@ -29,6 +30,35 @@ def normalize_skill_key(value: object) -> str:
 
 
 def promise_target_signature(promise: Promise) -> dict:
+    # Promises are matched against many events but edited rarely, so the
+    # normalized signature is kept on the promise until its target changes.
+    key = (
+        promise.target_event_type,
+        promise.target_event_tag,
+        tuple(promise.target_event_tags or ()),
+        promise.target_event_tags_match_mode,
+    )
+    cached = getattr(promise, "_target_signature", None)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    signature = _build_promise_target_signature(promise)
+    matcher = compile_signal_matcher(
+        target_event_type=signature["target_event_type"],
+        target_tags=signature["target_tags"],
+        tag_match_mode=signature["tag_match_mode"],
+    )
+    promise._target_signature = (key, signature, matcher)
+    return signature
+
+
+def promise_target_matcher(promise: Promise) -> "SignalMatcher":
+    """Returns the compiled matcher for the promise's current target."""
+    promise_target_signature(promise)
+    return promise._target_signature[2]
+
+
+def _build_promise_target_signature(promise: Promise) -> dict:
     target_type = normalize_signal_value(promise.target_event_type)
     target_tags = normalize_signal_tags([promise.target_event_tag, *(promise.target_event_tags or [])])
 
@@ -76,3 +106,52 @@ def match_signal(
         return SignalMatchResult(True, reason="event type matched")
 
     return SignalMatchResult(False, reason="no target signal")
+
+
+SignalMatcher = Callable[[set[str], set[str]], bool]
+
+
+def normalize_event_signal(event_type: object, tags: Optional[Iterable[object]]) -> tuple[set[str], set[str]]:
+    """Normalizes an event once so it can be checked against many compiled matchers."""
+    return set(normalize_signal_tags([event_type])), set(normalize_signal_tags(tags))
+
+
+def compile_signal_matcher(
+    *,
+    target_event_type: Optional[object] = None,
+    target_tags: Optional[Iterable[object]] = None,
+    tag_match_mode: Optional[str] = "any",
+) -> SignalMatcher:
+    """
+    Specializes match_signal(...).matched for a fixed target.
+
+    The returned function takes the (event_types, tags) sets produced by
+    normalize_event_signal and skips the per-call normalization and mode
+    dispatch that match_signal does.
+    """
+    return _compile_normalized_signal_matcher(
+        normalize_signal_value(target_event_type),
+        frozenset(normalize_signal_tags(target_tags)),
+        normalize_signal_value(tag_match_mode) or "any",
+    )
+
+
+# Promises are reloaded every few seconds by the processors, but their targets
+# rarely change, so identical targets share one compiled matcher.
+@lru_cache(maxsize=4096)
+def _compile_normalized_signal_matcher(required_type: str, required_tags: frozenset[str], mode: str) -> SignalMatcher:
+    if required_tags:
+        if mode == "all":
+            tags_match = required_tags.issubset
+        else:
+            def tags_match(source_tags: set[str]) -> bool:
+                return not required_tags.isdisjoint(source_tags)
+
+        if required_type:
+            return lambda event_types, source_tags: required_type in event_types and tags_match(source_tags)
+        return lambda event_types, source_tags: tags_match(source_tags)
+
+    if required_type:
+        return lambda event_types, source_tags: required_type in event_types
+
+    return lambda event_types, source_tags: False
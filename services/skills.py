@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from gabru.db.db import DB
 from gabru.db.service import CRUDService
@@ -6,6 +6,11 @@ from model.skill import Skill
 
 
 class SkillService(CRUDService[Skill]):
+    # Bumped on every create/update/delete through any instance, so
+    # SkillXPProcessor can drop its short-lived per-user copies when skills
+    # change elsewhere in the process.
+    changes = 0
+
     def __init__(self):
         super().__init__("skills", DB("rasbhari"), user_scoped=True)
 
@@ -53,6 +58,52 @@ class SkillService(CRUDService[Skill]):
     def _get_columns_for_select(self) -> List[str]:
         return ["id", "user_id", "name", "tag_key", "aliases", "level", "total_xp", "requirement"]
 
+    def create(self, obj: Skill) -> Optional[int]:
+        skill_id = super().create(obj)
+        SkillService.changes += 1
+        return skill_id
+
+    def update(self, obj: Skill) -> bool:
+        updated = super().update(obj)
+        SkillService.changes += 1
+        return updated
+
+    def delete(self, obj_id: int) -> bool:
+        deleted = super().delete(obj_id)
+        SkillService.changes += 1
+        return deleted
+
+    def add_xp(self, skill_ids: List[int], xp: int) -> Dict[int, int]:
+        """
+        Adds xp to each skill in the database itself, so concurrent edits to
+        total_xp are built on rather than overwritten. Returns the new total_xp
+        per skill id that still exists.
+        """
+        if not skill_ids:
+            return {}
+        query = "UPDATE skills SET total_xp = total_xp + %s WHERE id = ANY(%s)"
+        params = [xp, list(skill_ids)]
+        user_scope = self._get_request_user_scope()
+        if user_scope is not None:
+            query += f" AND {self.user_scope_column} = %s"
+            params.append(user_scope)
+        query += " RETURNING id, total_xp"
+
+        def operation(conn):
+            with conn.cursor() as cursor:
+                cursor.execute(query, tuple(params))
+                rows = cursor.fetchall()
+                conn.commit()
+                return dict(rows)
+
+        try:
+            return self._run_with_connection_retry(operation, fallback={}, action_name="add_xp on skills")
+        except Exception as e:
+            self.db.rollback_quietly()
+            self.log.exception(e)
+            self.log.warning("Adding %s XP failed for skills %s", xp, skill_ids)
+            return {}
+
     def get_by_name(self, name: str) -> Optional[Skill]:
         return self.find_one_by_field("name", name)
 
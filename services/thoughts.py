@@ -4,7 +4,7 @@ from datetime import datetime
 from gabru.db.db import DB
 from gabru.db.service import CRUDService
 from model.thought import Thought
-from services.eventing import emit_event_safely
+from services.eventing import emit_event_in_background
 
 
 class ThoughtService(CRUDService[Thought]):
@@ -21,7 +21,7 @@ class ThoughtService(CRUDService[Thought]):
             with self.db.conn.cursor() as cursor:
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS thoughts (
-                        id SERIAL PRIMARY KEY,
+                        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
                         user_id INTEGER NOT NULL,
                         message VARCHAR(500) NOT NULL,
                         created_at TIMESTAMP WITHOUT TIME ZONE
@@ -39,13 +39,9 @@ class ThoughtService(CRUDService[Thought]):
         )
 
     def _to_object(self, row: tuple) -> Thought:
-        thought_dict = {
-            "id": row[0],
-            "user_id": row[1],
-            "message": row[2],
-            "created_at": row[3]
-        }
-        return Thought(**thought_dict)
+        # Columns come back in _get_columns_for_select order with model types,
+        # so build the model without re-validating every row.
+        return Thought.model_construct(id=row[0], user_id=row[1], message=row[2], created_at=row[3])
 
     def _get_columns_for_insert(self) -> List[str]:
         return ["user_id", "message", "created_at"]
@@ -59,7 +55,9 @@ class ThoughtService(CRUDService[Thought]):
     def create(self, obj: Thought) -> Optional[int]:
         res = super().create(obj)
         if res:
-            emit_event_safely(
+            # Written by the background event writer so the request returns
+            # as soon as the thought itself is stored.
+            emit_event_in_background(
                 self.log,
                 user_id=obj.user_id,
                 event_type="thought:posted",
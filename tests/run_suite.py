@@ -14,10 +14,12 @@ TEST_GROUPS = {
     "unit": [
         "tests.test_assistant_command_service",
         "tests.test_db_reconnect",
+        "tests.test_event_service",
         "tests.test_eventing",
         "tests.test_import_pipeline",
         "tests.test_notification_policy",
         "tests.test_promise_processor",
+        "tests.test_project_updater",
         "tests.test_project_work_linking",
         "tests.test_recommendation_followups",
         "tests.test_session_inference_processor",
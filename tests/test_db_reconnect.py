@@ -2,7 +2,7 @@ import unittest
 from unittest import mock
 
 from gabru.db.db import DB
-from gabru.db.service import ReadOnlyService
+from gabru.db.service import CRUDService, ReadOnlyService
 
 
 class DummyService(ReadOnlyService[dict]):
@@ -17,6 +17,29 @@ class DummyService(ReadOnlyService[dict]):
         return ["id"]
 
 
+class DummyCRUDService(CRUDService[mock.Mock]):
+    def __init__(self, db):
+        super().__init__("dummy", db)
+
+    def _create_table(self):
+        pass
+
+    def _to_object(self, row: tuple):
+        return mock.Mock(id=row[0], name=row[1])
+
+    def _to_tuple(self, obj) -> tuple:
+        return (obj.name,)
+
+    def _get_columns_for_insert(self):
+        return ["name"]
+
+    def _get_columns_for_update(self):
+        return ["name"]
+
+    def _get_columns_for_select(self):
+        return ["id", "name"]
+
+
 class DBReconnectTests(unittest.TestCase):
     def test_run_with_connection_retry_invalidates_and_retries_once(self):
         db = mock.Mock(spec=DB)
@@ -39,6 +62,165 @@ class DBReconnectTests(unittest.TestCase):
         db.invalidate_connection.assert_called_once()
         self.assertEqual(calls["count"], 2)
 
+    def test_find_all_builds_operator_clauses(self):
+        db = mock.Mock(spec=DB)
+        conn = mock.MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [(1,)]
+        db.get_conn.return_value = conn
+
+        service = DummyService(db)
+        result = service.find_all(filters={"id": {"$in": [1, 2], "$gt": 0, "$lt": 5}, "name": "x"})
+
+        self.assertEqual(result, [{"id": 1}])
+        query, params = cursor.execute.call_args.args
+        self.assertIn("WHERE id = ANY(%s) AND id > %s AND id < %s AND name = %s", query)
+        self.assertEqual(params, ([1, 2], 0, 5, "x"))
+
+    def test_find_all_matches_none_with_is_null(self):
+        db = mock.Mock(spec=DB)
+        conn = mock.MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+        db.get_conn.return_value = conn
+
+        service = DummyService(db)
+        service.find_all(filters={"name": None, "id": 3})
+
+        query, params = cursor.execute.call_args.args
+        self.assertIn("WHERE name IS NULL AND id = %s", query)
+        self.assertEqual(params, (3,))
+
+    def test_iter_all_streams_through_named_cursor(self):
+        db = mock.Mock(spec=DB)
+        conn = mock.MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+        db.get_conn.return_value = conn
+
+        service = DummyService(db)
+        rows = service.iter_all(filters={"id": {"$gt": 0}}, batch_size=2)
+
+        conn.cursor.assert_not_called()
+        self.assertEqual(list(rows), [{"id": 1}, {"id": 2}, {"id": 3}])
+        self.assertTrue(conn.cursor.call_args.kwargs["name"].startswith("dummy_iter_"))
+        self.assertTrue(conn.cursor.call_args.kwargs["withhold"])
+        cursor.fetchmany.assert_called_with(2)
+        cursor.execute.assert_called_once_with("SELECT id FROM dummy WHERE id > %s", (0,))
+        cursor.close.assert_called_once()
+
+    def test_iter_all_reopens_on_a_dropped_connection(self):
+        db = mock.Mock(spec=DB)
+        stale = mock.MagicMock()
+        stale.cursor.return_value.execute.side_effect = RuntimeError("server closed the connection")
+        fresh = mock.MagicMock()
+        fresh.cursor.return_value.fetchmany.side_effect = [[(1,)], []]
+        db.get_conn.side_effect = [stale, fresh]
+        db.is_connection_error.return_value = True
+
+        service = DummyService(db)
+
+        self.assertEqual(list(service.iter_all()), [{"id": 1}])
+        db.invalidate_connection.assert_called_once()
+        stale.cursor.return_value.close.assert_called_once()
+
+    def test_create_many_inserts_in_one_statement(self):
+        db = mock.Mock(spec=DB)
+        db.dbname = "dummy"
+        conn = mock.MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        db.get_conn.return_value = conn
+        service = DummyCRUDService(db)
+        first = mock.Mock(id=None)
+        first.name = "a"
+        second = mock.Mock(id=None)
+        second.name = "b"
+
+        with mock.patch("gabru.db.service.execute_values", return_value=[(11,), (12,)]) as execute_values:
+            self.assertEqual(service.create_many([first, second]), [11, 12])
+
+        execute_values.assert_called_once_with(
+            cursor, "INSERT INTO dummy (name) VALUES %s RETURNING id", [("a",), ("b",)], page_size=500, fetch=True
+        )
+        conn.commit.assert_called_once()
+
+    def test_scoped_update_checks_ownership_in_the_same_statement(self):
+        db = mock.Mock(spec=DB)
+        db.dbname = "dummy"
+        conn = mock.MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.rowcount = 0
+        db.get_conn.return_value = conn
+        service = DummyCRUDService(db)
+        obj = mock.Mock(id=4)
+        obj.name = "a"
+
+        with mock.patch.object(DummyCRUDService, "_get_request_user_scope", return_value=7), \
+             mock.patch.object(DummyCRUDService, "_apply_request_user_scope_to_object"):
+            self.assertFalse(service.update(obj))
+
+        cursor.execute.assert_called_once_with("UPDATE dummy SET name=%s WHERE id=%s AND user_id = %s", ("a", 4, 7))
+
+    def test_update_many_sends_one_batch(self):
+        db = mock.Mock(spec=DB)
+        db.dbname = "dummy"
+        conn = mock.MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        db.get_conn.return_value = conn
+        service = DummyCRUDService(db)
+        first = mock.Mock(id=1)
+        first.name = "a"
+        second = mock.Mock(id=2)
+        second.name = "b"
+
+        with mock.patch("gabru.db.service.execute_batch") as execute_batch:
+            self.assertTrue(service.update_many([first, second]))
+
+        execute_batch.assert_called_once_with(cursor, "UPDATE dummy SET name=%s WHERE id=%s", [("a", 1), ("b", 2)])
+        conn.commit.assert_called_once()
+
+    def test_update_many_writes_each_id_once(self):
+        db = mock.Mock(spec=DB)
+        db.dbname = "dummy"
+        db.get_conn.return_value = mock.MagicMock()
+        service = DummyCRUDService(db)
+        stale = mock.Mock(id=1)
+        stale.name = "old"
+        fresh = mock.Mock(id=1)
+        fresh.name = "new"
+
+        with mock.patch("gabru.db.service.execute_batch") as execute_batch:
+            self.assertTrue(service.update_many([stale, fresh]))
+
+        self.assertEqual(execute_batch.call_args.args[2], [("new", 1)])
+
+    def test_update_many_can_limit_the_written_columns(self):
+        db = mock.Mock(spec=DB)
+        db.dbname = "dummy"
+        db.get_conn.return_value = mock.MagicMock()
+        service = DummyCRUDService(db)
+        obj = mock.Mock(id=3, count=5)
+
+        with mock.patch("gabru.db.service.execute_batch") as execute_batch:
+            self.assertTrue(service.update_many([obj], columns=["count"]))
+
+        self.assertEqual(execute_batch.call_args.args[1], "UPDATE dummy SET count=%s WHERE id=%s")
+        self.assertEqual(execute_batch.call_args.args[2], [(5, 3)])
+
+    def test_execute_prepared_prepares_once_per_connection(self):
+        db = DB("prepared_test")
+        cursor = mock.Mock()
+        cursor.connection = object()
+
+        db.execute_prepared(cursor, "dummy_items_after", "SELECT id FROM dummy WHERE id > $1", (1,))
+        db.execute_prepared(cursor, "dummy_items_after", "SELECT id FROM dummy WHERE id > $1", (2,))
+        self.assertEqual(cursor.execute.call_count, 3)
+
+        cursor.connection = object()
+        db.execute_prepared(cursor, "dummy_items_after", "SELECT id FROM dummy WHERE id > $1", (3,))
+        self.assertEqual(cursor.execute.call_count, 5)
+        db.invalidate_connection()
+
 
 if __name__ == "__main__":
     unittest.main()
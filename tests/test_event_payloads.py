@@ -1,5 +1,6 @@
 import os
 import unittest
+from datetime import datetime
 from unittest import mock
 
 os.environ.setdefault("LOG_DIR", "/tmp/rasbhari-test-logs")
@@ -7,10 +8,24 @@ os.environ.setdefault("LOG_DIR", "/tmp/rasbhari-test-logs")
 from model.activity import Activity
 from model.event import Event
 from services.activities import ActivityService
+from services.events import EventService
 from services.report_aggregator import ReportAggregator
 
 
 class EventPayloadSupportTests(unittest.TestCase):
+    def test_event_rows_convert_with_payload_and_tags(self):
+        service = EventService.__new__(EventService)
+        timestamp = datetime(2026, 4, 7, 9, 0, 0)
+
+        event = service._to_object((5, 7, "reading:done", timestamp, None, ["books", "evening"], {"pages": 12}))
+        bare = service._to_object((6, 7, "reading:done", timestamp, "", None, None))
+
+        self.assertEqual(event, Event(id=5, user_id=7, event_type="reading:done", timestamp=timestamp,
+                                      description=None, tags=["books", "evening"], payload={"pages": 12}))
+        self.assertIs(event.event_type, bare.event_type)
+        self.assertEqual(bare.tags, [])
+        self.assertEqual(bare.payload, {})
+
     def test_report_request_payload_prefers_structured_event_payload(self):
         aggregator = ReportAggregator()
 
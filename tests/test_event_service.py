@@ -0,0 +1,121 @@
+import os
+import unittest
+from datetime import date, datetime
+from unittest import mock
+
+os.environ.setdefault("LOG_DIR", "/tmp/rasbhari-test-logs")
+
+from services.events import EventService
+
+
+class EventPartitionTests(unittest.TestCase):
+    def setUp(self):
+        self.service = EventService.__new__(EventService)
+        self.service.db = mock.MagicMock()
+        self.service.log = mock.Mock()
+        self.cursor = self.service.db.conn.cursor.return_value.__enter__.return_value
+        self._previous_month = EventService._partitioned_month
+        EventService._partitioned_month = None
+
+    def tearDown(self):
+        EventService._partitioned_month = self._previous_month
+
+    def _create_statements(self):
+        return [call.args[0] for call in self.cursor.execute.call_args_list if call.args[0].startswith("CREATE TABLE")]
+
+    def test_creates_current_and_upcoming_months_across_year_end(self):
+        self.cursor.fetchone.side_effect = [(None,), None] * 3
+
+        self.service._ensure_monthly_partitions(date(2026, 11, 15))
+
+        statements = self._create_statements()
+        self.assertEqual(len(statements), 3)
+        self.assertIn("events_y2026m11 PARTITION OF events FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')", statements[0])
+        self.assertIn("events_y2026m12 PARTITION OF events FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')", statements[1])
+        self.assertIn("events_y2027m01 PARTITION OF events FOR VALUES FROM ('2027-01-01') TO ('2027-02-01')", statements[2])
+
+    def test_skips_existing_partitions_and_months_already_in_default(self):
+        self.cursor.fetchone.side_effect = [
+            ("events_y2026m04",),  # April already split out
+            (None,), (1,),         # May has rows in events_default
+            (None,), None,         # June is new
+        ]
+
+        self.service._ensure_monthly_partitions(date(2026, 4, 2))
+        self.service._ensure_monthly_partitions(date(2026, 4, 20))
+
+        statements = self._create_statements()
+        self.assertEqual(len(statements), 1)
+        self.assertIn("events_y2026m06", statements[0])
+        self.service.log.warning.assert_not_called()
+
+    def test_failed_partition_is_rolled_back_and_logged(self):
+        self.cursor.execute.side_effect = [RuntimeError("lock timeout")] + [None] * 10
+        self.cursor.fetchone.side_effect = [(None,), None, (None,), None]
+
+        self.service._ensure_monthly_partitions(date(2026, 4, 2))
+
+        self.service.db.rollback_quietly.assert_called_once()
+        self.service.log.warning.assert_called_once()
+        self.assertEqual(len(self._create_statements()), 2)
+
+    def test_switches_only_columns_not_yet_on_lz4(self):
+        self.cursor.fetchall.return_value = [("description",)]
+
+        self.service._use_lz4_compression()
+
+        self.assertEqual(
+            self.cursor.execute.call_args.args[0],
+            "ALTER TABLE events ALTER COLUMN description SET COMPRESSION lz4",
+        )
+
+    def test_lz4_switch_is_skipped_on_servers_without_it(self):
+        self.cursor.execute.side_effect = RuntimeError('column "attcompression" does not exist')
+
+        self.service._use_lz4_compression()
+
+        self.service.db.rollback_quietly.assert_called_once()
+        self.service.log.warning.assert_called_once()
+
+
+class EventTimeRangeQueryTests(unittest.TestCase):
+    def setUp(self):
+        self.service = EventService.__new__(EventService)
+        self.service.table_name = "events"
+        self.service.user_scoped = False
+        self.service.user_scope_column = "user_id"
+        self.service.db = mock.MagicMock()
+        self.service.log = mock.Mock()
+        self.cursor = self.service.db.get_conn.return_value.cursor.return_value.__enter__.return_value
+
+    def test_passes_event_types_as_one_array_parameter(self):
+        row = (1, 2, "coding:start", datetime(2026, 4, 2, 9, 0), "", ["work"], {})
+        self.cursor.fetchall.return_value = [row]
+
+        events = self.service.find_by_event_type_and_time_range(["coding:start", "coding:stop"], 2000, 1000)
+
+        query, params = self.cursor.execute.call_args.args
+        self.assertIn("event_type = ANY(%s) AND timestamp > %s AND timestamp < %s", query)
+        self.assertTrue(query.endswith("ORDER BY timestamp ASC"))
+        self.assertEqual(
+            params,
+            (["coding:start", "coding:stop"], datetime.fromtimestamp(1000), datetime.fromtimestamp(2000)),
+        )
+        self.assertEqual([event.event_type for event in events], ["coding:start"])
+
+    def test_latest_event_before_is_scoped_to_the_request_user(self):
+        self.service.user_scoped = True
+        self.service._get_request_user_scope = mock.Mock(return_value=2)
+        self.cursor.fetchone.return_value = (7, 2, "coding:start", datetime(2026, 4, 2, 9, 0), "", [], {})
+
+        event = self.service.find_latest_event_before("coding:start", 10_000_000)
+
+        query, params = self.cursor.execute.call_args.args
+        self.assertIn("AND user_id = %s", query)
+        self.assertTrue(query.endswith("ORDER BY timestamp DESC LIMIT 1"))
+        self.assertEqual(params, ("coding:start", datetime.fromtimestamp(10_000_000), 2))
+        self.assertEqual(event.id, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
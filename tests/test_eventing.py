@@ -47,6 +47,21 @@ class EmitEventSafelyTests(unittest.TestCase):
         self.assertIsNone(created_id)
         fake_log.warning.assert_called_once()
 
+    def test_background_events_are_written_in_one_batch(self):
+        fake_log = mock.Mock()
+        fake_service = mock.Mock()
+        fake_service.create_many.return_value = [21, 22]
+
+        with mock.patch.object(eventing, "get_event_service", return_value=fake_service), \
+             mock.patch.object(eventing, "_ensure_background_writer"):
+            self.assertTrue(eventing.emit_event_in_background(fake_log, user_id=7, event_type="coding:session:start"))
+            self.assertTrue(eventing.emit_event_in_background(fake_log, user_id=7, event_type="coding:session:end"))
+            eventing.flush_background_events()
+
+        written = fake_service.create_many.call_args.args[0]
+        self.assertEqual([event.event_type for event in written], ["coding:session:start", "coding:session:end"])
+        fake_log.warning.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
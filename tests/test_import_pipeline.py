@@ -19,6 +19,9 @@ class FakeImportRecordService:
     def update(self, record):
         return True
 
+    def update_many(self, records):
+        return True
+
     def get_by_source_key(self, *, user_id, source_type, source_name, external_id):
         for record in self.records:
             if (
@@ -50,6 +53,9 @@ class FakeEventService:
         self.events.append(event)
         return len(self.events)
 
+    def create_many(self, events):
+        return [self.create(event) for event in events]
+
 
 class FakeCalendarAdapter:
     def fetch_records(self, user_id, since=None):
@@ -118,6 +124,35 @@ class ImportPipelineTests(unittest.TestCase):
         self.assertEqual(result.emitted_events, 1)
         self.assertEqual(self.event_service.events[0].event_type, "calendar:event")
         self.assertIn("source:calendar", self.event_service.events[0].tags)
+        self.assertEqual(self.record_service.records[0].imported_event_id, 1)
+
+    def test_failed_batch_falls_back_to_single_event_writes(self):
+        self.event_service.create_many = lambda events: []
+        original_create = self.event_service.create
+        self.event_service.create = lambda event: None if event.description == "Broken" else original_create(event)
+        items = [
+            NormalizedImportItem(
+                source_type="Calendar",
+                source_name="Work Calendar",
+                external_id=f"evt-{index}",
+                occurred_at=datetime(2026, 4, 2, 9, index, 0),
+                title=title,
+                description=title,
+                normalized_event_type="calendar:event",
+            )
+            for index, title in enumerate(["Standup", "Broken", "Review"])
+        ]
+
+        adapter = FakeCalendarAdapter()
+        adapter.fetch_records = lambda user_id, since=None: items
+        result = self.pipeline.import_from_adapter(user_id=7, adapter=adapter, emit_events=True)
+
+        self.assertEqual(result.imported, 3)
+        self.assertEqual(result.emitted_events, 2)
+        self.assertEqual(
+            [record.imported_event_id for record in self.record_service.records],
+            [1, None, 2],
+        )
 
 
 if __name__ == "__main__":
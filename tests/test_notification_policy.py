@@ -76,7 +76,7 @@ class CourierNotificationTests(unittest.TestCase):
         self.courier.get_ntfy_url_for_event = mock.Mock(return_value="https://ntfy.example/topic")
 
         response = mock.Mock(status_code=200)
-        with mock.patch("processes.courier.courier.requests.post", return_value=response) as post_mock:
+        with mock.patch.object(self.courier.http_session, "post", return_value=response) as post_mock:
             self.assertTrue(self.courier.send_ntfy_notification(event, "review", "Weekly review ready"))
 
         headers = post_mock.call_args.kwargs["headers"]
@@ -0,0 +1,37 @@
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("LOG_DIR", "/tmp/rasbhari-test-logs")
+
+from processes.project_updater import ProjectUpdater
+
+
+class ProjectLookupTests(unittest.TestCase):
+    def setUp(self):
+        self.updater = ProjectUpdater.__new__(ProjectUpdater)
+        self.updater.project_service = mock.Mock()
+        self.updater._active_event_user_id = 1
+
+    def _project(self, project_id, name):
+        project = mock.Mock(id=project_id)
+        project.name = name
+        return project
+
+    def test_finds_the_users_project_by_dashed_name_in_one_query(self):
+        project = self._project(5, "Mini Camera")
+        self.updater.project_service.find_all.return_value = [self._project(4, "Rasbhari"), project]
+
+        self.assertIs(self.updater._find_project("Mini-Camera"), project)
+        self.updater.project_service.find_all.assert_called_once_with(filters={"user_id": 1})
+
+    def test_every_lookup_sees_projects_created_since_the_last_one(self):
+        created = self._project(5, "Mini Camera")
+        self.updater.project_service.find_all.side_effect = [[], [created]]
+
+        self.assertIsNone(self.updater._find_project("mini-camera"))
+        self.assertIs(self.updater._find_project("mini-camera"), created)
+
+
+if __name__ == "__main__":
+    unittest.main()
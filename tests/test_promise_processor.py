@@ -1,13 +1,17 @@
 import os
 import unittest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest import mock
 
+import psycopg2
+
 os.environ.setdefault("LOG_DIR", "/tmp/rasbhari-test-logs")
 
 from model.event import Event
 from model.promise import Promise
 from processes.promise_processor import PromiseProcessor
+from services.promises import PROMISE_COUNTER_COLUMNS, PROMISE_EVALUATION_COLUMNS
+from services.signal_matching import promise_target_signature
 
 
 class PromiseProcessorProjectWorkTests(unittest.TestCase):
@@ -95,18 +99,37 @@ class PromiseProcessorProjectWorkTests(unittest.TestCase):
             created_at=datetime(2026, 4, 1, 9, 0, 0),
             updated_at=datetime(2026, 4, 1, 9, 0, 0),
         )
-        self.processor._count_matching_events = mock.Mock(return_value=0)
-        self.processor.promise_service.update = mock.Mock(return_value=True)
+        self.processor.event_service.iter_all = mock.Mock(return_value=iter([]))
+        self.processor.promise_service.get_due_promises = mock.Mock(return_value=[promise])
+        self.processor.promise_service.update_many = mock.Mock(return_value=True)
 
-        self.processor._evaluate_promise(
-            promise,
-            datetime(2026, 4, 2, 9, 0, 0, tzinfo=timezone.utc),
-        )
+        self.processor._check_due_promises()
 
         self.assertEqual(promise.status, "broken")
         self.assertEqual(promise.streak, 0)
         self.assertEqual(promise.total_periods, 1)
-        self.processor.promise_service.update.assert_called_once()
+        self.processor.promise_service.update_many.assert_called_once_with([promise], columns=PROMISE_EVALUATION_COLUMNS)
+        self.processor.promise_service.update.assert_not_called()
+
+    def test_due_sweep_queries_events_once_per_user(self):
+        created_at = datetime(2026, 4, 1, 9, 0, 0)
+        walk = Promise(id=1, user_id=1, name="Walk", frequency="daily", target_event_type="walk", created_at=created_at)
+        read = Promise(id=2, user_id=1, name="Read", frequency="weekly", target_event_type="read", created_at=created_at)
+        self.processor.promise_service.get_due_promises = mock.Mock(return_value=[walk, read])
+        self.processor.promise_service.update_many = mock.Mock(return_value=True)
+        self.processor.event_service.iter_all = mock.Mock(return_value=[
+            Event(id=1, user_id=1, event_type="read", timestamp=datetime.now() - timedelta(days=3)),
+            Event(id=2, user_id=1, event_type="walk", timestamp=datetime.now() - timedelta(days=3)),
+        ])
+
+        self.processor._check_due_promises()
+
+        self.processor.event_service.iter_all.assert_called_once()
+        filters = self.processor.event_service.iter_all.call_args.kwargs["filters"]
+        self.assertEqual(filters["event_type"], {"$in": ["read", "walk"]})
+        self.assertEqual(walk.status, "broken")
+        self.assertEqual(read.status, "active")
+        self.assertEqual(read.streak, 1)
 
     def test_due_promise_event_processing_includes_broken_recurring_promise(self):
         now = datetime.now()
@@ -132,13 +155,92 @@ class PromiseProcessorProjectWorkTests(unittest.TestCase):
             updated_at=now,
         )
         self.processor.promise_service.find_all = mock.Mock(return_value=[promise])
-        self.processor.promise_service.update = mock.Mock(return_value=True)
+        self.processor.promise_service.update_many = mock.Mock(return_value=True)
 
         result = self.processor._process_item(event)
 
         self.assertTrue(result)
         self.assertEqual(promise.current_count, 1)
-        self.processor.promise_service.update.assert_called_once()
+        self.processor.promise_service.update_many.assert_called_once_with([promise], columns=PROMISE_COUNTER_COLUMNS)
+
+    def test_user_promises_are_reused_within_cache_window(self):
+        promise = Promise(id=9, user_id=1, name="Daily walk", frequency="daily", target_event_type="walk:logged")
+        self.processor.promise_service.find_all = mock.Mock(return_value=[promise])
+
+        first = self.processor._get_user_promises(1)
+        second = self.processor._get_user_promises(1)
+        self.processor._invalidate_user_promises(1)
+        self.processor._get_user_promises(1)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.processor.promise_service.find_all.call_count, 2)
+
+    def test_promise_writes_elsewhere_drop_cached_promises(self):
+        promise = Promise(id=9, user_id=1, name="Daily walk", frequency="daily", target_event_type="walk:logged")
+        self.processor.promise_service.find_all = mock.Mock(return_value=[promise])
+
+        self.processor._get_user_promises(1)
+        with mock.patch("processes.promise_processor.PromiseService.changes", 41, create=True):
+            self.processor._get_user_promises(1)
+
+        self.assertEqual(self.processor.promise_service.find_all.call_count, 2)
+
+    def test_event_unrelated_to_any_promise_skips_matching(self):
+        promise = Promise(id=9, user_id=1, name="Daily walk", frequency="daily", target_event_type="walk:logged")
+        event = Event(id=15, user_id=1, event_type="coding:session", timestamp=datetime.now(), tags=["python"])
+        self.processor.promise_service.find_all = mock.Mock(return_value=[promise])
+        self.processor._event_matches_promise = mock.Mock()
+
+        self.assertTrue(self.processor._process_item(event))
+
+        self.processor._event_matches_promise.assert_not_called()
+
+    def test_due_promise_sweep_is_throttled(self):
+        self.processor._check_due_promises = mock.Mock()
+
+        self.processor._check_due_promises_if_needed()
+        self.processor._check_due_promises_if_needed()
+        self.processor._next_due_check_at = 0.0
+        self.processor._check_due_promises_if_needed()
+
+        self.assertEqual(self.processor._check_due_promises.call_count, 2)
+
+    def test_failed_due_sweep_is_logged_and_retried_next_interval(self):
+        def dropped_mid_stream(filters=None):
+            yield Event(id=1, user_id=1, event_type="walk", timestamp=datetime.now())
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+        walk = Promise(id=1, user_id=1, name="Walk", frequency="daily", target_event_type="walk",
+                       created_at=datetime(2026, 4, 1, 9, 0, 0))
+        self.processor.promise_service.get_due_promises = mock.Mock(return_value=[walk])
+        self.processor.event_service.iter_all = mock.Mock(side_effect=dropped_mid_stream)
+
+        self.processor._check_due_promises_if_needed()
+
+        self.processor.promise_service.update_many.assert_not_called()
+        self.processor._next_due_check_at = 0.0
+        self.processor._check_due_promises_if_needed()
+        self.assertEqual(self.processor.event_service.iter_all.call_count, 2)
+
+    def test_promise_target_signature_is_kept_until_target_changes(self):
+        promise = Promise(id=3, user_id=1, name="Read", target_event_type="Reading:Session")
+
+        first = promise_target_signature(promise)
+        self.assertIs(promise_target_signature(promise), first)
+
+        promise.target_event_type = "reading:done"
+        self.assertEqual(promise_target_signature(promise)["target_event_type"], "reading:done")
+
+    def test_period_bounds_follow_frequency(self):
+        end = datetime(2026, 4, 8, 9, 0, 0, tzinfo=timezone.utc)
+        weekly = Promise(user_id=1, name="Weekly review", frequency="weekly", target_event_type="review")
+        once = Promise(user_id=1, name="Ship it", frequency="once", target_event_type="ship",
+                       created_at=datetime(2026, 4, 1, 9, 0, 0))
+
+        self.assertEqual(self.processor._get_start_time(weekly, end), datetime(2026, 4, 1, 9, 0, 0, tzinfo=timezone.utc))
+        self.assertEqual(self.processor._calculate_next_check(weekly, end), datetime(2026, 4, 15, 9, 0, 0, tzinfo=timezone.utc))
+        self.assertEqual(self.processor._get_start_time(once, end), datetime(2026, 4, 1, 9, 0, 0, tzinfo=timezone.utc))
+        self.assertGreater(self.processor._calculate_next_check(once, end).year, 2100)
 
 
 if __name__ == "__main__":
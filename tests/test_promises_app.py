@@ -71,11 +71,12 @@ class PromisesAppTests(unittest.TestCase):
                  mock.patch.object(PermissionManager, "can_access_route", return_value=True), \
                  mock.patch.object(self.app_instance.service, "get_by_id", return_value=promise), \
                  mock.patch.object(self.app_instance.service, "update", return_value=True) as update_mock, \
-                 mock.patch("services.events.EventService") as event_service_cls:
-                event_service_cls.return_value.find_all.return_value = [matching_event, non_matching_event]
+                 mock.patch("apps.promises.event_service") as event_service:
+                event_service.find_all.return_value = [matching_event, non_matching_event]
 
                 response = self.client.post("/promises/4/refresh")
 
+        event_service.find_all.assert_called_once()
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get_json()["current_count"], 1)
         self.assertEqual(promise.current_count, 1)
@@ -27,7 +27,7 @@ class SessionInferenceProcessorTests(unittest.TestCase):
         opened = Event(user_id=7, event_type="local:app:opened", timestamp=start, tags=["app:pycharm"])
         closed = Event(user_id=7, event_type="local:app:closed", timestamp=start + timedelta(minutes=42), tags=["app:pycharm"])
 
-        with mock.patch("processes.session_inference_processor.emit_event_safely") as emit_mock:
+        with mock.patch("processes.session_inference_processor.emit_event_in_background") as emit_mock:
             self.processor._process_item(opened)
             self.processor._process_item(closed)
 
@@ -41,7 +41,7 @@ class SessionInferenceProcessorTests(unittest.TestCase):
         opened = Event(user_id=7, event_type="local:app:opened", timestamp=start, tags=["app:logseq"])
         idle = Event(user_id=7, event_type="local:user:idle", timestamp=start + timedelta(minutes=8), tags=[])
 
-        with mock.patch("processes.session_inference_processor.emit_event_safely") as emit_mock:
+        with mock.patch("processes.session_inference_processor.emit_event_in_background") as emit_mock:
             self.processor._process_item(opened)
             self.processor._process_item(idle)
 
@@ -54,7 +54,7 @@ class SessionInferenceProcessorTests(unittest.TestCase):
         coding_event = Event(user_id=7, event_type="local:app:opened", timestamp=start, tags=["app:pycharm"])
         planning_event = Event(user_id=7, event_type="local:app:opened", timestamp=start + timedelta(minutes=10), tags=["app:logseq"])
 
-        with mock.patch("processes.session_inference_processor.emit_event_safely") as emit_mock:
+        with mock.patch("processes.session_inference_processor.emit_event_in_background") as emit_mock:
             self.processor._process_item(coding_event)
             self.processor._process_item(planning_event)
 
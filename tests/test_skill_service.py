@@ -1,9 +1,13 @@
 import os
 import unittest
+from datetime import datetime
+from unittest import mock
 
 os.environ.setdefault("LOG_DIR", "/tmp/rasbhari-test-logs")
 
+from model.event import Event
 from model.skill import Skill
+from processes.skill_xp_processor import LEVEL_COLUMNS, SkillXPProcessor
 from services.skills import SkillService
 
 
@@ -29,5 +33,63 @@ class SkillServiceLogicTests(unittest.TestCase):
         self.assertEqual(snapshot["xp_remaining"], 50)
 
 
+
+class SkillXPProcessorTests(unittest.TestCase):
+    def setUp(self):
+        patchers = [
+            mock.patch("processes.skill_xp_processor.SkillService"),
+            mock.patch("processes.skill_xp_processor.EventService"),
+            mock.patch("processes.skill_xp_processor.SkillLevelHistoryService"),
+            mock.patch("gabru.qprocessor.qprocessor.QueueService"),
+        ]
+        self.addCleanup(mock.patch.stopall)
+        self.skill_service_cls = patchers[0].start()
+        self.skill_service_cls.changes = 0
+        for patcher in patchers[1:]:
+            patcher.start()
+
+        self.processor = SkillXPProcessor(enabled=False)
+        self.skill_service = self.processor.skill_service
+        self.skill_service.normalize_skill_tag.side_effect = SkillService.normalize_skill_tag
+        self.skill_service.get_match_keys.side_effect = SkillService.get_match_keys
+        self.skill_service.derive_level.side_effect = SkillService.derive_level
+
+    def _event(self):
+        return Event(id=7, user_id=1, event_type="coding", timestamp=datetime(2026, 4, 2, 10, 0, 0), tags=["python"])
+
+    def test_xp_is_added_in_the_database_and_level_follows_the_returned_total(self):
+        skill = Skill(id=3, user_id=1, name="Python", tag_key="python", total_xp=0, level=1)
+        self.skill_service.find_all.return_value = [skill]
+        # Someone else raised the stored total since the cached copy was read.
+        self.skill_service.add_xp.return_value = {3: 110}
+
+        self.assertTrue(self.processor._process_item(self._event()))
+
+        self.skill_service.add_xp.assert_called_once_with([3], 20)
+        self.assertEqual(skill.total_xp, 110)
+        self.assertEqual(skill.level, 2)
+        self.skill_service.update_many.assert_called_once_with([skill], columns=LEVEL_COLUMNS)
+        self.processor.skill_history_service.create_many.assert_called_once()
+
+    def test_level_is_not_written_when_no_level_is_crossed(self):
+        skill = Skill(id=3, user_id=1, name="Python", tag_key="python", total_xp=0, level=1)
+        self.skill_service.find_all.return_value = [skill]
+        self.skill_service.add_xp.return_value = {3: 20}
+
+        self.processor._process_item(self._event())
+
+        self.skill_service.update_many.assert_not_called()
+
+    def test_skill_writes_elsewhere_drop_the_cached_skills(self):
+        self.skill_service.find_all.return_value = []
+        self.processor._get_user_skills(1)
+        self.processor._get_user_skills(1)
+        self.assertEqual(self.skill_service.find_all.call_count, 1)
+
+        self.skill_service_cls.changes += 1
+        self.processor._get_user_skills(1)
+        self.assertEqual(self.skill_service.find_all.call_count, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,54 +1,114 @@
 import cv2
+import logging
+import os
+import queue
+import subprocess
 import time
-import sys
-from flask import Flask, Response, render_template
+from logging.handlers import QueueHandler, QueueListener
+from flask import Flask, Response, redirect, render_template, send_from_directory
 
 CAMERA_INDEX = 0
 MJPEG_BOUNDARY = 'frame_boundary'
 DELAY_TIME = 0.05
+# Optional GStreamer capture pipeline ending in appsink, e.g. a v4l2src pipeline
+# that lets the Pi's ISP do scaling/conversion instead of the CPU.
+CAMERA_PIPELINE = os.getenv('CAMERA_PIPELINE')
+JPEG_QUALITY = int(os.getenv('CAMERA_JPEG_QUALITY', '80'))
+# When set, ffmpeg captures the camera and writes an HLS playlist plus segments
+# into this directory; Flask only serves those files and never touches frames.
+HLS_DIR = os.getenv('CAMERA_HLS_DIR')
+HLS_PLAYLIST = 'stream.m3u8'
+CAMERA_DEVICE = os.getenv('CAMERA_DEVICE', '/dev/video0')
+
+# Fixed part of every multipart frame header; only the length varies per frame.
+FRAME_HEADER_PREFIX = (b'--' + MJPEG_BOUNDARY.encode('utf-8') + b'\r\n'
+                       b'Content-Type: image/jpeg\r\n'
+                       b'Content-Length: ')
+JPEG_ENCODE_PARAMS = [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY]
+
+# Stream threads only enqueue log records; a listener thread does the actual
+# write, so logging never holds up frame delivery.
+log = logging.getLogger('outside_camera')
+log.setLevel(logging.INFO)
+_log_queue = queue.SimpleQueue()
+log.addHandler(QueueHandler(_log_queue))
+log.propagate = False
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+log_listener = QueueListener(_log_queue, _console_handler)
+log_listener.start()
+
+# Encode failures are reported on the first one and then every this many.
+ENCODE_FAILURE_LOG_EVERY = 100
 
 app = Flask(__name__)
 
-video_camera = cv2.VideoCapture(CAMERA_INDEX)
 
-if video_camera.isOpened():
-    video_camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    video_camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    print(
-        f"Set resolution to {video_camera.get(cv2.CAP_PROP_FRAME_WIDTH)}x{video_camera.get(cv2.CAP_PROP_FRAME_HEIGHT)}")
-
-if not video_camera.isOpened():
-    print(f"Error: Could not open video camera with index {CAMERA_INDEX}. Exiting.")
-    video_camera = None
+def start_hls_segmenter():
+    os.makedirs(HLS_DIR, exist_ok=True)
+    return subprocess.Popen([
+        'ffmpeg', '-loglevel', 'error',
+        '-f', 'v4l2', '-video_size', '640x480', '-i', CAMERA_DEVICE,
+        '-vf', 'fps=20', '-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'zerolatency', '-g', '40',
+        '-f', 'hls', '-hls_time', '2', '-hls_list_size', '5', '-hls_flags', 'delete_segments',
+        os.path.join(HLS_DIR, HLS_PLAYLIST),
+    ])
+
+
+video_camera = None
+hls_segmenter = None
+
+if HLS_DIR:
+    # ffmpeg owns the device, so OpenCV does not open it.
+    hls_segmenter = start_hls_segmenter()
+else:
+    if CAMERA_PIPELINE:
+        video_camera = cv2.VideoCapture(CAMERA_PIPELINE, cv2.CAP_GSTREAMER)
+    else:
+        video_camera = cv2.VideoCapture(CAMERA_INDEX)
+
+    if video_camera.isOpened() and not CAMERA_PIPELINE:
+        video_camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        video_camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        video_camera.set(cv2.CAP_PROP_FPS, 30)
+        log.info("Set resolution to %sx%s",
+                 video_camera.get(cv2.CAP_PROP_FRAME_WIDTH), video_camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    if not video_camera.isOpened():
+        if CAMERA_PIPELINE:
+            log.error("Could not open video camera with GStreamer pipeline %r.", CAMERA_PIPELINE)
+        else:
+            log.error("Could not open video camera with index %s.", CAMERA_INDEX)
+        video_camera = None
 
 
 def gen_frames():
     if video_camera is None:
         return
 
+    encode_failures = 0
     while True:
         success, frame = video_camera.read()
 
         if not success:
-            print("Warning: Failed to read frame from camera. Releasing camera.")
+            log.warning("Failed to read frame from camera. Ending stream.")
             break
 
-        ret, buffer = cv2.imencode('.jpg', frame)
+        ret, buffer = cv2.imencode('.jpg', frame, JPEG_ENCODE_PARAMS)
 
         if not ret:
-            print("Error: Failed to encode frame as JPEG.")
+            if encode_failures % ENCODE_FAILURE_LOG_EVERY == 0:
+                log.warning("Failed to encode frame as JPEG (%d so far on this stream).", encode_failures + 1)
+            encode_failures += 1
             time.sleep(DELAY_TIME)
             continue
 
-        frame_bytes = buffer.tobytes()
-
-        yield (b'--' + MJPEG_BOUNDARY.encode('utf-8') + b'\r\n'
-                                                        b'Content-Type: image/jpeg\r\n'
-                                                        b'Content-Length: ' + str(len(frame_bytes)).encode(
-            'utf-8') + b'\r\n'
-                       b'\r\n' + frame_bytes + b'\r\n')
-
-        time.sleep(DELAY_TIME)
+        # One join per frame, reading the JPEG straight out of the encode buffer,
+        # instead of a chain of concatenations that copies the frame each time.
+        frame_bytes = memoryview(buffer).cast('B')
+        yield b''.join((FRAME_HEADER_PREFIX, b'%d\r\n\r\n' % len(frame_bytes), frame_bytes, b'\r\n'))
+        # No sleep here: read() already blocks until the camera delivers the
+        # next frame, so the stream runs at the camera's own frame rate.
 
 
 @app.route('/')
@@ -58,6 +118,8 @@ def index():
 
 @app.route('/stream')
 def video_feed():
+    if hls_segmenter is not None:
+        return redirect(f'/hls/{HLS_PLAYLIST}')
     if video_camera is None:
         return Response("Camera Failed to Initialize.", status=500, mimetype='text/plain')
 
@@ -65,20 +127,34 @@ def video_feed():
                     mimetype=f'multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}')
 
 
+@app.route('/hls/<path:filename>')
+def hls_files(filename):
+    if hls_segmenter is None:
+        return Response("HLS streaming is not enabled.", status=404, mimetype='text/plain')
+    # Served straight from disk; the playlist is rewritten every segment, so
+    # conditional requests let players revalidate it cheaply.
+    return send_from_directory(HLS_DIR, filename, conditional=True, max_age=0)
+
+
 @app.route('/health')
 def health_check():
     return {'status': 'ok'}
 
 if __name__ == '__main__':
     try:
-        print("Starting camera stream application...")
+        log.info("Starting camera stream application...")
         app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
 
     except Exception as e:
-        print(f"An error occurred during application run: {e}", file=sys.stderr)
+        log.exception("An error occurred during application run: %s", e)
 
     finally:
         if video_camera and video_camera.isOpened():
-            print("Releasing camera resource.")
+            log.info("Releasing camera resource.")
             video_camera.release()
-        print("Application stopped.")
+        if hls_segmenter and hls_segmenter.poll() is None:
+            log.info("Stopping HLS segmenter.")
+            hls_segmenter.terminate()
+            hls_segmenter.wait(timeout=5)
+        log.info("Application stopped.")
+        log_listener.stop()